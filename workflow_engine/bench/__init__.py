@@ -0,0 +1,5 @@
+"""
+Benchmarks - Synthetic workloads for measuring the engine's own overhead
+
+Run with `python -m workflow_engine.bench`.
+"""
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Bench CLI - python -m workflow_engine.bench [--scenario NAME] [--quick] [--output FILE] [--compare FILE]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+
+from workflow_engine.bench.runner import SCENARIOS, run_suite, compare_reports
+
+def print_report(report: dict):
+    print(f"commit {report['commit'] or '-'}  python {report['python']}")
+    print(f"{'scenario':<10} {'nodes':>6} {'execs':>6} {'failed':>6} {'exec/s':>9} "
+          f"{'node us':>8} {'p50 ms':>8} {'p99 ms':>8} {'rss MB':>7}")
+    for result in report["scenarios"]:
+        print(
+            f"{result['name']:<10} {result['nodes']:>6} {result['executions']:>6} {result['failed']:>6} "
+            f"{result['executions_per_sec']:>9} {result['node_overhead_us']:>8} "
+            f"{result['latency_ms']['p50']:>8} {result['latency_ms']['p99']:>8} {result['peak_rss_mb'] or '-':>7}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Workflow Engine benchmarks")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="Scenario to run (repeatable; default: all)")
+    parser.add_argument("--quick", action="store_true", help="Smaller workflows and fewer executions")
+    parser.add_argument("--executions", type=int, help="Executions per scenario")
+    parser.add_argument("--concurrency", type=int, help="Concurrent executions")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stand-in API latency (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Stand-in API error rate (0-1)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against")
+    args = parser.parse_args()
+    
+    # Per-node INFO logging would dominate the measurements
+    logging.getLogger().setLevel(logging.WARNING)
+    
+    report = asyncio.run(run_suite(
+        args.scenario, args.quick, args.executions, args.concurrency, args.latency, args.error_rate
+    ))
+    print_report(report)
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nrelative to {args.compare} (commit {baseline.get('commit') or '-'}):")
+        for row in compare_reports(baseline, report):
+            print(f"  {row['name']:<10} exec/s x{row['executions_per_sec']}  "
+                  f"p99 x{row['p99_ms']}  node us x{row['node_overhead_us']}")
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+    
+    failed = sum(result["failed"] for result in report["scenarios"])
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Bench Runner - Runs benchmark scenarios and reports throughput, latency and memory
+"""
+
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, Any, Callable, List, Optional
+
+from workflow_engine.config import WorkflowConfigManager
+from workflow_engine.workflow_engine import WorkflowEngine
+from workflow_engine.bench import workflows
+from workflow_engine.bench.server import StandInServer
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of numbers (0.0 when empty)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, in MiB (None where unsupported)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def git_commit() -> Optional[str]:
+    """Commit of the working tree being measured, when run from a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(__file__), capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+class BenchmarkRunner:
+    """Runs workflows on a fresh, quiet engine and measures them
+
+    Every scenario gets its own engine configured from a temporary
+    workflow_config.json (journal off, history kept in memory) so runs do
+    not touch ./workflows or interfere with each other. Without a work_dir
+    a temporary directory is used and removed by cleanup().
+    """
+
+    def __init__(self, work_dir: Optional[str] = None, engine_config: Optional[Dict] = None):
+        self._temp_dir = None if work_dir else tempfile.TemporaryDirectory(prefix="workflow_bench_")
+        self.work_dir = work_dir or self._temp_dir.name
+        self.engine_config = engine_config or {}
+
+    def cleanup(self):
+        """Remove the temporary work directory, if one was created"""
+        if self._temp_dir is not None:
+            self._temp_dir.cleanup()
+            self._temp_dir = None
+
+    def _make_engine(self, concurrency: int) -> WorkflowEngine:
+        config = {
+            "workflows": {"storage_path": os.path.join(self.work_dir, "data")},
+            "engine": {
+                "max_concurrent_executions": concurrency,
+                "max_queued_executions": concurrency,
+                **self.engine_config
+            },
+            "history": {"max_executions": 1000, "spill": False},
+            "journal": {"enabled": False},
+            "cache": {"disk": False}
+        }
+        config_path = os.path.join(self.work_dir, "workflow_config.json")
+        with open(config_path, "w") as f:
+            json.dump(config, f)
+        engine = WorkflowEngine(WorkflowConfigManager(config_path))
+        for node_type, node_class in workflows.BENCH_NODE_TYPES.items():
+            engine.register_node_type(node_type, node_class)
+        return engine
+
+    async def run(
+        self,
+        name: str,
+        workflow_def: Dict,
+        executions: int,
+        concurrency: int = 10,
+        make_data: Optional[Callable[[int], Dict]] = None
+    ) -> Dict[str, Any]:
+        """Run `executions` executions of a workflow, `concurrency` at a time"""
+        engine = self._make_engine(concurrency)
+        load_started = time.perf_counter()
+        if not engine.load_workflow(name, workflow_def):
+            await engine.shutdown()
+            raise ValueError(f"Benchmark workflow '{name}' failed to load")
+        load_seconds = time.perf_counter() - load_started
+
+        latencies: List[float] = []
+        failed = 0
+        nodes_executed = 0
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(index: int):
+            nonlocal failed, nodes_executed
+            async with semaphore:
+                started = time.perf_counter()
+                execution_id = await engine.execute_workflow(name, make_data(index) if make_data else {})
+                execution = await engine.wait_for_execution(execution_id)
+                latencies.append(time.perf_counter() - started)
+            node_results = (execution or {}).get("data") or {}
+            nodes_executed += len(node_results)
+            if execution is None or execution.get("status") != "completed" or not all(
+                isinstance(result, dict) and result.get("success") for result in node_results.values()
+            ):
+                failed += 1
+
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(run_one(index) for index in range(executions)))
+        finally:
+            wall_seconds = time.perf_counter() - started
+            cpu_seconds = time.process_time() - cpu_started
+            await engine.shutdown()
+
+        return {
+            "name": name,
+            "nodes": len(workflow_def["nodes"]),
+            "executions": executions,
+            "concurrency": concurrency,
+            "failed": failed,
+            "load_ms": round(load_seconds * 1000, 2),
+            "wall_seconds": round(wall_seconds, 3),
+            "executions_per_sec": round(executions / wall_seconds, 2) if wall_seconds else 0.0,
+            "nodes_executed": nodes_executed,
+            # Engine CPU time per node run (scheduling, bookkeeping, node call)
+            "node_overhead_us": round(cpu_seconds * 1e6 / nodes_executed, 2) if nodes_executed else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(latencies, 0.50) * 1000, 2),
+                "p90": round(percentile(latencies, 0.90) * 1000, 2),
+                "p99": round(percentile(latencies, 0.99) * 1000, 2),
+                "max": round(max(latencies, default=0.0) * 1000, 2)
+            },
+            "peak_rss_mb": peak_rss_mb()
+        }
+
+# Scenario builders; "executions" is (quick, full)
+SCENARIOS = {
+    "chain": {"build": lambda quick: workflows.linear_chain(20 if quick else 100),
+              "executions": (50, 500), "concurrency": 10},
+    "fanout": {"build": lambda quick: workflows.fan_out(20 if quick else 200),
+               "executions": (50, 500), "concurrency": 10},
+    "diamond": {"build": lambda quick: workflows.diamond(20 if quick else 100),
+                "executions": (50, 500), "concurrency": 10},
+    "dag_10k": {"build": lambda quick: workflows.random_dag(1000 if quick else 10000),
+                "executions": (2, 5), "concurrency": 1},
+    "api": {"build": None, "executions": (20, 200), "concurrency": 20},
+}
+
+async def run_suite(
+    names: Optional[List[str]] = None,
+    quick: bool = False,
+    executions: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    latency: float = 0.05,
+    error_rate: float = 0.05
+) -> Dict[str, Any]:
+    """Run the named scenarios (all by default) and return the JSON report"""
+    names = names or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(unknown)}")
+
+    runner = BenchmarkRunner()
+    results = []
+    try:
+        for name in names:
+            scenario = SCENARIOS[name]
+            count = executions or scenario["executions"][0 if quick else 1]
+            parallel = concurrency or scenario["concurrency"]
+            logger.info(f"Running scenario {name} ({count} executions, concurrency {parallel})")
+            if name == "api":
+                async with StandInServer(latency=latency, error_rate=error_rate) as server:
+                    workflow_def = workflows.api_pipeline(server.url, os.path.join(runner.work_dir, "audio"))
+                    result = await runner.run(
+                        name, workflow_def, count, parallel,
+                        make_data=lambda index: {"topic": f"story {index}"}
+                    )
+                    result["server"] = server.get_stats()
+            else:
+                result = await runner.run(name, scenario["build"](quick), count, parallel)
+            results.append(result)
+    finally:
+        runner.cleanup()
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": quick,
+        "scenarios": results
+    }
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Per-scenario ratios of current to baseline (throughput > 1 and latency < 1 are better)"""
+    previous = {result["name"]: result for result in baseline.get("scenarios", [])}
+    rows = []
+    for result in current.get("scenarios", []):
+        before = previous.get(result["name"])
+        if before is None:
+            continue
+
+        def ratio(after_value, before_value):
+            return round(after_value / before_value, 3) if before_value else None
+
+        rows.append({
+            "name": result["name"],
+            "executions_per_sec": ratio(result["executions_per_sec"], before["executions_per_sec"]),
+            "p99_ms": ratio(result["latency_ms"]["p99"], before["latency_ms"]["p99"]),
+            "node_overhead_us": ratio(result["node_overhead_us"], before["node_overhead_us"])
+        })
+    return rows
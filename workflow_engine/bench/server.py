@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Bench Server - Local stand-in for the OpenRouter and ElevenLabs APIs
+"""
+
+import asyncio
+import logging
+import random
+from typing import Dict, Optional
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+class StandInServer:
+    """aiohttp server answering like the real providers, with simulated latency and errors
+
+    Routes:
+    - POST /api/v1/chat/completions - OpenRouter chat completion
+    - POST /v1/text-to-speech/{voice} - ElevenLabs speech, streamed in chunks
+
+    Each request waits `latency` seconds (plus up to `jitter`); a fraction
+    `error_rate` of requests is answered with 429 (with Retry-After) or 503.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.05,
+        jitter: float = 0.02,
+        error_rate: float = 0.0,
+        audio_bytes: int = 256 * 1024,
+        seed: int = 1
+    ):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.audio_bytes = audio_bytes
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/api/v1/chat/completions", self._chat_completion)
+        app.router.add_post("/v1/text-to-speech/{voice}", self._text_to_speech)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # Port 0 picks a free port
+        self.port = site._server.sockets[0].getsockname()[1]
+        logger.info(f"Stand-in server listening on {self.url}")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "StandInServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    async def _simulate(self) -> Optional[web.Response]:
+        """Wait out the simulated latency; return an error response for failed requests"""
+        self.requests += 1
+        await asyncio.sleep(self.latency + self._random.random() * self.jitter)
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.errors += 1
+            if self._random.random() < 0.5:
+                return web.Response(status=429, headers={"Retry-After": "0.1"}, text="rate limited")
+            return web.Response(status=503, text="unavailable")
+        return None
+
+    async def _chat_completion(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        error = await self._simulate()
+        if error is not None:
+            return error
+        prompt = payload.get("messages", [{}])[-1].get("content", "")
+        content = f"Once upon a time ({prompt[-40:]})..."
+        return web.json_response({
+            "id": f"bench-{self.requests}",
+            "model": payload.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4}
+        })
+
+    async def _text_to_speech(self, request: web.Request) -> web.StreamResponse:
+        await request.read()
+        error = await self._simulate()
+        if error is not None:
+            return error
+        response = web.StreamResponse(headers={"Content-Type": "audio/mpeg"})
+        await response.prepare(request)
+        chunk = b"\0" * 16384
+        remaining = self.audio_bytes
+        while remaining > 0:
+            await response.write(chunk[:remaining])
+            remaining -= len(chunk)
+        await response.write_eof()
+        return response
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"requests": self.requests, "errors": self.errors}
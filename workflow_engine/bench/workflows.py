@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Bench Workflows - Synthetic workflow definitions and no-op nodes
+"""
+
+import asyncio
+import random
+from typing import Dict, Any, List
+
+from workflow_engine.nodes.base_node import BaseNode
+
+class NoopNode(BaseNode):
+    """Does no work (or sleeps "delay" seconds) so only engine overhead is measured"""
+
+    async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        delay = self.get_parameter("delay", 0)
+        if delay:
+            await asyncio.sleep(delay)
+        return {"node": self.node_id}
+
+# Node types registered on the benchmark engine
+BENCH_NODE_TYPES = {"noop": NoopNode}
+
+def _workflow(name: str, nodes: List[Dict], connections: Dict[str, List[str]]) -> Dict:
+    return {"id": name, "name": name, "nodes": nodes, "connections": connections}
+
+def _trigger() -> Dict:
+    return {"id": "trigger", "type": "trigger", "parameters": {}}
+
+def _noop(node_id: str, delay: float = 0) -> Dict:
+    return {"id": node_id, "type": "noop", "parameters": {"delay": delay} if delay else {}}
+
+def linear_chain(length: int, delay: float = 0) -> Dict:
+    """trigger -> n1 -> n2 -> ... -> n<length>"""
+    nodes = [_trigger()] + [_noop(f"n{i}", delay) for i in range(1, length + 1)]
+    connections = {"trigger": ["n1"]}
+    for i in range(1, length):
+        connections[f"n{i}"] = [f"n{i + 1}"]
+    return _workflow(f"chain_{length}", nodes, connections)
+
+def fan_out(width: int, delay: float = 0) -> Dict:
+    """trigger -> width parallel nodes"""
+    nodes = [_trigger()] + [_noop(f"n{i}", delay) for i in range(width)]
+    return _workflow(f"fanout_{width}", nodes, {"trigger": [f"n{i}" for i in range(width)]})
+
+def diamond(width: int, delay: float = 0) -> Dict:
+    """trigger -> split -> width parallel nodes -> join"""
+    nodes = [_trigger(), _noop("split")] + [_noop(f"n{i}", delay) for i in range(width)] + [_noop("join")]
+    connections = {"trigger": ["split"], "split": [f"n{i}" for i in range(width)]}
+    for i in range(width):
+        connections[f"n{i}"] = ["join"]
+    return _workflow(f"diamond_{width}", nodes, connections)
+
+def random_dag(size: int, max_parents: int = 3, window: int = 50, seed: int = 1) -> Dict:
+    """A layered random DAG: every node has 1..max_parents parents among the previous `window` nodes"""
+    rng = random.Random(seed)
+    node_ids = ["trigger"] + [f"n{i}" for i in range(1, size)]
+    nodes = [_trigger()] + [_noop(node_id) for node_id in node_ids[1:]]
+    connections: Dict[str, List[str]] = {}
+    for i in range(1, size):
+        candidates = node_ids[max(0, i - window):i]
+        for parent in rng.sample(candidates, min(len(candidates), rng.randint(1, max_parents))):
+            connections.setdefault(parent, []).append(node_ids[i])
+    return _workflow(f"dag_{size}", nodes, connections)
+
+def api_pipeline(base_url: str, output_dir: str, retries: bool = True) -> Dict:
+    """trigger -> AI script (OpenRouter stand-in) -> voiceover (ElevenLabs stand-in)"""
+    retry = {"retry": {"max_retries": 3, "backoff": 0.05, "max_retry_after": 0.2}} if retries else {}
+    nodes = [
+        _trigger(),
+        dict({
+            "id": "script",
+            "type": "ai",
+            "parameters": {
+                "provider": "openrouter",
+                "api_key": "bench",
+                "base_url": f"{base_url}/api/v1",
+                "prompt": "Write a short story about {{$json.topic}}"
+            }
+        }, **retry),
+        dict({
+            "id": "voiceover",
+            "type": "voiceover",
+            "parameters": {
+                "provider": "elevenlabs",
+                "api_key": "bench",
+                "base_url": f"{base_url}/v1",
+                "text": "{{$json.response}}",
+                "output_dir": output_dir
+            }
+        }, **retry),
+    ]
+    return _workflow("api_pipeline", nodes, {"trigger": ["script"], "script": ["voiceover"]})
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Request Coalescing - Share one in-flight call between identical requests
+"""
+
+import asyncio
+import copy
+import logging
+from typing import Dict, Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+class _Flight:
+    """One in-flight call and the number of callers waiting on it"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one underlying call
+
+    The first caller for a key starts the call; callers arriving while it
+    is in flight wait for the same result (or exception). The call is only
+    cancelled when every waiter has been cancelled.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Run factory() for key, or join the call already in flight"""
+        flight = self._flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _Flight(asyncio.ensure_future(factory()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+            logger.debug(f"Coalesced request {key}")
+
+        flight.waiters += 1
+        try:
+            result = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.task.cancelled():
+                raise
+            flight.waiters -= 1
+            if flight.waiters == 0:
+                flight.task.cancel()
+            raise
+        flight.waiters -= 1
+
+        # Followers get their own copy so executions cannot see each other's mutations
+        return result if leader else copy.deepcopy(result)
+
+    def _forget(self, key: str, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently in flight"""
+        return len(self._flights)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Underlying calls made and calls that were coalesced into them"""
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._flights)}
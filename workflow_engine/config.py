@@ -28,10 +28,62 @@ class WorkflowConfigManager:
             },
             "http": {
                 "default_headers": {},
-                "timeout": 30
+                "timeout": 30,
+                "connect_timeout": 10,
+                "pool_limit": 100,
+                "pool_limit_per_host": 20,
+                "keepalive_timeout": 30,
+                "dns_cache_ttl": 300
             },
             "workflows": {
                 "storage_path": "./workflows"
+            },
+            "database": {
+                "backend": "json",
+                "indexes": ["url", "video_id", "status"],
+                "cache_max_bytes": 268435456,
+                "batch_writes": False,
+                "batch_max_size": 100,
+                "batch_max_delay": 0.05
+            },
+            "cache": {
+                "path": "./workflows/cache/responses.sqlite3",
+                "disk": True,
+                "max_memory_entries": 1000,
+                "default_ttl": 86400
+            },
+            "engine": {
+                "max_concurrent_nodes": 64,
+                "stream_buffer_size": 100,
+                "thread_pool_size": 8,
+                "process_pool_size": 0,
+                "max_concurrent_executions": 10,
+                "max_queued_executions": 100
+            },
+            "history": {
+                "max_executions": 1000,
+                "max_age": 86400,
+                "max_bytes": 67108864,
+                "max_result_bytes": 0,
+                "spill": False,
+                "path": "./workflows/history/executions.sqlite3"
+            },
+            "journal": {
+                "enabled": False,
+                "path": "./workflows/journal",
+                "fsync_interval": 0.05
+            },
+            "circuit_breaker": {
+                "enabled": True,
+                "failure_threshold": 5,
+                "reset_timeout": 30
+            },
+            "rate_limits": {},
+            "metrics": {
+                "enabled": True,
+                "measure_bytes": False,
+                "host": "127.0.0.1",
+                "port": 9464
             }
         }
         
@@ -47,6 +99,22 @@ class WorkflowConfigManager:
                         config["http"].update(file_config["http"])
                     if "workflows" in file_config:
                         config["workflows"].update(file_config["workflows"])
+                    if "database" in file_config:
+                        config["database"].update(file_config["database"])
+                    if "cache" in file_config:
+                        config["cache"].update(file_config["cache"])
+                    if "engine" in file_config:
+                        config["engine"].update(file_config["engine"])
+                    if "history" in file_config:
+                        config["history"].update(file_config["history"])
+                    if "journal" in file_config:
+                        config["journal"].update(file_config["journal"])
+                    if "circuit_breaker" in file_config:
+                        config["circuit_breaker"].update(file_config["circuit_breaker"])
+                    if "rate_limits" in file_config:
+                        config["rate_limits"].update(file_config["rate_limits"])
+                    if "metrics" in file_config:
+                        config["metrics"].update(file_config["metrics"])
             except Exception as e:
                 print(f"Warning: Could not load config file: {e}")
         
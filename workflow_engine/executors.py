@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Node Executors - Thread and process pools for blocking and CPU-bound nodes
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Dict, Any, Optional
+
+from workflow_engine import expressions
+
+logger = logging.getLogger(__name__)
+
+EXECUTION_CLASSES = ("io", "thread", "cpu")
+
+def run_node_sync(
+    node_class,
+    node_config: Dict,
+    config_manager,
+    input_data: Any,
+    items: bool = False,
+    outputs: Optional[Dict[str, Dict]] = None
+) -> Any:
+    """Run one node call in a worker thread or process
+
+    A fresh instance is created in the worker, without the engine's shared
+    services (those belong to the event loop), so offloaded nodes must not
+    rely on state kept by setup(). `outputs` holds the results of the nodes
+    its parameter templates refer to.
+    """
+    node = node_class(node_config, config_manager)
+    with expressions.bound(input_data, outputs or {}):
+        if items:
+            return asyncio.run(node.execute_batch(input_data))
+        return node.run_sync(input_data)
+
+class NodeExecutors:
+    """Lazily created pools that nodes are dispatched to by execution class
+
+    "io" nodes run on the event loop, "thread" nodes in a thread pool and
+    "cpu" nodes in a process pool (inputs, outputs and the node class must
+    be picklable, and the class importable by the worker processes).
+    """
+
+    def __init__(self, engine_config: Optional[Dict] = None):
+        engine_config = engine_config or {}
+        self.thread_pool_size = engine_config.get("thread_pool_size") or min(32, (os.cpu_count() or 1) + 4)
+        self.process_pool_size = engine_config.get("process_pool_size") or os.cpu_count() or 1
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+    def get_pool(self, execution_class: str) -> Executor:
+        """Get the pool for "thread" or "cpu" nodes, creating it on first use"""
+        if execution_class == "thread":
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.thread_pool_size, thread_name_prefix="workflow-node"
+                )
+            return self._thread_pool
+        if execution_class == "cpu":
+            if self._process_pool is None:
+                # Spawned workers do not inherit the event loop or open sockets
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_pool_size,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._process_pool
+        raise ValueError(f"No pool for execution class: {execution_class}")
+
+    async def run(self, execution_class: str, node, input_data: Any, items: bool = False) -> Any:
+        """Run a node call in the pool for its execution class"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.get_pool(execution_class),
+            run_node_sync, type(node), node.node_config, node.config_manager, input_data, items,
+            expressions.get_outputs(node.node_references())
+        )
+
+    def shutdown(self):
+        """Shut down the pools that were started"""
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False, cancel_futures=True)
+            self._thread_pool = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Expressions - Compiled {{$json.field}} templates for node parameters
+"""
+
+import contextvars
+import functools
+import json
+import re
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, Iterable, Mapping, Optional, Set, Tuple, Union
+
+# Only {{...}} blocks starting with $ are expressions; any other {{...}}
+# (mustache in a prompt, a literal example) is plain text
+EXPRESSION_RE = re.compile(r"\{\{\s*(\$.*?)\s*\}\}", re.S)
+
+# format_string templates also accept str.format-style {field} placeholders;
+# as in str.format, a {{ or }} that does not open a $json/$node/$now
+# expression is an escaped brace
+FORMAT_RE = re.compile(
+    r"\{\{\s*(?P<expression>\$(?:json|node|now)\b.*?)\s*\}\}"
+    r"|(?P<open>\{\{)|(?P<close>\}\})"
+    r"|\{(?P<field>[A-Za-z_][\w.]*)(?::(?P<spec>[^{}]*))?\}", re.S
+)
+
+ROOT_RE = re.compile(r"\$(json|now|node)\b")
+PATH_RE = re.compile(r"\.([A-Za-z_$][\w$-]*)|\[\s*(?:(-?\d+)|\"([^\"]*)\"|'([^']*)')\s*\]")
+
+_UNBOUND = object()
+
+# Input of the node being executed, and outputs of the nodes already run
+_input: contextvars.ContextVar = contextvars.ContextVar("expression_input", default=_UNBOUND)
+_outputs: contextvars.ContextVar = contextvars.ContextVar("expression_outputs", default=None)
+
+class Expression:
+    """One {{...}} reference: $json, $now or $node.<id>, followed by a path"""
+
+    __slots__ = ("source", "root", "node_id", "path")
+
+    def __init__(self, source: str, root: str, node_id: Optional[str], path: Tuple[Union[str, int], ...]):
+        self.source = source
+        self.root = root
+        self.node_id = node_id
+        self.path = path
+
+    def evaluate(self, json_data: Any, outputs: Optional[Mapping[str, Dict]]) -> Any:
+        if self.root == "now":
+            return datetime.now().isoformat()
+        if self.root == "json":
+            value = json_data
+        else:
+            result = (outputs or {}).get(self.node_id)
+            value = result.get("data") if isinstance(result, dict) and result.get("success") else None
+        for key in self.path:
+            if isinstance(value, dict):
+                value = value.get(key)
+            elif isinstance(value, (list, tuple)) and isinstance(key, int) and -len(value) <= key < len(value):
+                value = value[key]
+            else:
+                return None
+        return value
+
+class _FormatField:
+    """A str.format-style {field} placeholder of a format_string template"""
+
+    __slots__ = ("name", "path", "spec")
+
+    def __init__(self, name: str, spec: Optional[str]):
+        self.name = name
+        self.path = tuple(name.split("."))
+        self.spec = spec
+
+    def evaluate(self, json_data: Any, outputs: Optional[Mapping[str, Dict]]) -> Any:
+        if not isinstance(json_data, dict):
+            if self.name == "data":
+                return json_data
+            raise KeyError(self.name)
+        value = json_data
+        for key in self.path:
+            if not isinstance(value, dict) or key not in value:
+                raise KeyError(self.name)
+            value = value[key]
+        return format(value, self.spec) if self.spec else value
+
+def parse_expression(source: str) -> Expression:
+    """Parse the inside of a {{...}} block"""
+    match = ROOT_RE.match(source)
+    if not match:
+        raise ValueError(f"Invalid expression '{{{{{source}}}}}': expected $json, $node or $now")
+    root = match.group(1)
+    position = match.end()
+
+    path = []
+    while position < len(source):
+        step = PATH_RE.match(source, position)
+        if not step:
+            raise ValueError(f"Invalid expression '{{{{{source}}}}}' at '{source[position:]}'")
+        name, index, double_quoted, single_quoted = step.groups()
+        if index is not None:
+            path.append(int(index))
+        else:
+            path.append(name if name is not None else (double_quoted if double_quoted is not None else single_quoted))
+        position = step.end()
+
+    node_id = None
+    if root == "node":
+        if not path or not isinstance(path[0], str):
+            raise ValueError(f"Invalid expression '{{{{{source}}}}}': expected $node.<id> or $node[\"<id>\"]")
+        node_id = path.pop(0)
+    elif root == "now" and path:
+        raise ValueError(f"Invalid expression '{{{{{source}}}}}': $now takes no path")
+    return Expression(source, root, node_id, tuple(path))
+
+def _to_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return str(value)
+
+class Template:
+    """A string parameter split once into literal text and references
+
+    A template that is exactly one {{...}} block renders to the referenced
+    value itself (a list stays a list); otherwise references are rendered
+    as text (dicts and lists as JSON, missing values as "") in one pass.
+    """
+
+    __slots__ = ("source", "parts", "single")
+
+    def __init__(self, source: str, parts: Tuple[Any, ...]):
+        self.source = source
+        self.parts = parts
+        self.single = parts[0] if len(parts) == 1 and isinstance(parts[0], Expression) else None
+
+    def render(self, json_data: Any, outputs: Optional[Mapping[str, Dict]] = None) -> Any:
+        if self.single is not None:
+            return self.single.evaluate(json_data, outputs)
+        return "".join(
+            part if isinstance(part, str) else _to_text(part.evaluate(json_data, outputs))
+            for part in self.parts
+        )
+
+    def node_references(self) -> Set[str]:
+        return {part.node_id for part in self.parts if isinstance(part, Expression) and part.node_id}
+
+class _CompiledDict:
+    __slots__ = ("values",)
+
+    def __init__(self, values: Dict[str, Any]):
+        self.values = values
+
+    def render(self, json_data: Any, outputs: Optional[Mapping[str, Dict]] = None) -> Dict[str, Any]:
+        return {key: render_value(value, json_data, outputs) for key, value in self.values.items()}
+
+    def node_references(self) -> Set[str]:
+        return _references(self.values.values())
+
+class _CompiledList:
+    __slots__ = ("values",)
+
+    def __init__(self, values: list):
+        self.values = values
+
+    def render(self, json_data: Any, outputs: Optional[Mapping[str, Dict]] = None) -> list:
+        return [render_value(value, json_data, outputs) for value in self.values]
+
+    def node_references(self) -> Set[str]:
+        return _references(self.values)
+
+_COMPILED = (Template, _CompiledDict, _CompiledList)
+
+def _references(values: Iterable[Any]) -> Set[str]:
+    references: Set[str] = set()
+    for value in values:
+        if isinstance(value, _COMPILED):
+            references |= value.node_references()
+    return references
+
+def _split(text: str, pattern: "re.Pattern") -> Tuple[Any, ...]:
+    parts = []
+    position = 0
+
+    def literal(value: str):
+        if parts and isinstance(parts[-1], str):
+            parts[-1] += value
+        else:
+            parts.append(value)
+
+    for match in pattern.finditer(text):
+        if match.start() > position:
+            literal(text[position:match.start()])
+        groups = match.groupdict()
+        if groups.get("field") is not None:
+            parts.append(_FormatField(groups["field"], groups.get("spec")))
+        elif groups.get("open") is not None:
+            literal("{")
+        elif groups.get("close") is not None:
+            literal("}")
+        else:
+            parts.append(parse_expression(match.group(1)))
+        position = match.end()
+    if position < len(text):
+        literal(text[position:])
+    return tuple(parts)
+
+@functools.lru_cache(maxsize=4096)
+def compile_template(text: str) -> Union[Template, str]:
+    """Compile a string with {{...}} references, or return it unchanged when it has none"""
+    if "{{" not in text:
+        return text
+    parts = _split(text, EXPRESSION_RE)
+    if all(isinstance(part, str) for part in parts):
+        return text
+    return Template(text, parts)
+
+@functools.lru_cache(maxsize=1024)
+def compile_format(text: str) -> Template:
+    """Compile a format_string template ({{...}} references, {field} placeholders, {{/}} escapes)"""
+    return Template(text, _split(text, FORMAT_RE) or ("",))
+
+def compile_value(value: Any) -> Any:
+    """Compile the templates in a parameter value (strings, dicts and lists)
+
+    Values without any template are returned unchanged.
+    """
+    if isinstance(value, str):
+        return compile_template(value)
+    if isinstance(value, dict):
+        compiled = {key: compile_value(item) for key, item in value.items()}
+        if any(isinstance(item, _COMPILED) for item in compiled.values()):
+            return _CompiledDict(compiled)
+        return value
+    if isinstance(value, list):
+        compiled = [compile_value(item) for item in value]
+        if any(isinstance(item, _COMPILED) for item in compiled):
+            return _CompiledList(compiled)
+        return value
+    return value
+
+def compile_parameters(parameters: Dict[str, Any], exclude: Iterable[str] = ()) -> Dict[str, Any]:
+    """Compile a node's parameters, keeping only those that contain templates
+
+    Parameters named in exclude are left for the node to interpret. Raises
+    ValueError for malformed expressions.
+    """
+    compiled = {}
+    for key, value in parameters.items():
+        if key in exclude:
+            continue
+        value = compile_value(value)
+        if isinstance(value, _COMPILED):
+            compiled[key] = value
+    return compiled
+
+def is_compiled(value: Any) -> bool:
+    """Whether a value came out of compile_value with templates in it"""
+    return isinstance(value, _COMPILED)
+
+def render_value(value: Any, json_data: Any, outputs: Optional[Mapping[str, Dict]] = None) -> Any:
+    """Render a compiled value against explicit data"""
+    if isinstance(value, _COMPILED):
+        return value.render(json_data, outputs)
+    return value
+
+def render(value: Any, raw: Any = None) -> Any:
+    """Render a compiled value against the bound node input and outputs
+
+    Outside an execution (no input bound) the raw parameter is returned.
+    """
+    json_data = _input.get()
+    if json_data is _UNBOUND:
+        return raw
+    return render_value(value, json_data, _outputs.get())
+
+def render_for(value: Any, json_data: Any) -> Any:
+    """Render a compiled value against explicit input and the bound outputs"""
+    return render_value(value, json_data, _outputs.get())
+
+def bind_outputs(outputs: Mapping[str, Dict]) -> contextvars.Token:
+    """Make node results ({node_id: result}) visible to $node references"""
+    return _outputs.set(outputs)
+
+def reset_outputs(token: contextvars.Token):
+    _outputs.reset(token)
+
+def get_outputs(node_ids: Iterable[str]) -> Dict[str, Dict]:
+    """Results of the given nodes from the bound outputs (for worker processes)"""
+    outputs = _outputs.get() or {}
+    return {node_id: outputs[node_id] for node_id in node_ids if node_id in outputs}
+
+def bind_input(input_data: Any) -> contextvars.Token:
+    """Make a node's input visible to $json references"""
+    return _input.set(input_data)
+
+def reset_input(token: contextvars.Token):
+    _input.reset(token)
+
+@contextmanager
+def bound(input_data: Any, outputs: Optional[Mapping[str, Dict]] = None):
+    """Bind the input (and optionally outputs) for the duration of a block"""
+    input_token = _input.set(input_data)
+    outputs_token = _outputs.set(outputs) if outputs is not None else None
+    try:
+        yield
+    finally:
+        if outputs_token is not None:
+            _outputs.reset(outputs_token)
+        _input.reset(input_token)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+File I/O - Non-blocking, atomic file helpers for nodes
+"""
+
+import asyncio
+import functools
+import os
+import tempfile
+from typing import Any, Callable, Union
+
+async def run_blocking(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking call (disk I/O, parsing) in the default executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+def atomic_write(path: str, data: Union[bytes, str], fsync: bool = True):
+    """Write a file via a temporary file in the same directory and rename it into place
+
+    Readers see either the old or the new contents, never a partial file.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb" if isinstance(data, bytes) else "w") as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+async def write_file(path: str, data: Union[bytes, str], fsync: bool = True):
+    """Atomically write a file without blocking the event loop"""
+    await run_blocking(atomic_write, path, data, fsync)
+
+class AtomicFileWriter:
+    """Streams chunks into a temporary file and renames it into place on success
+
+    Every disk operation runs in the default executor. Used as an async
+    context manager; if the block raises, the partial file is removed and
+    the target path is left untouched.
+    """
+
+    def __init__(self, path: str, fsync: bool = True):
+        self.path = path
+        self.fsync = fsync
+        self.size = 0
+        self._file = None
+        self._tmp_path = None
+
+    def _open(self):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(
+            prefix=f".{os.path.basename(self.path)}.", suffix=".tmp", dir=directory
+        )
+        self._file = os.fdopen(fd, "wb")
+
+    def _commit(self):
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def _abort(self):
+        self._file.close()
+        try:
+            os.unlink(self._tmp_path)
+        except FileNotFoundError:
+            pass
+
+    async def __aenter__(self) -> "AtomicFileWriter":
+        await run_blocking(self._open)
+        return self
+
+    async def write(self, chunk: bytes):
+        """Append a chunk to the temporary file"""
+        await run_blocking(self._file.write, chunk)
+        self.size += len(chunk)
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            await run_blocking(self._commit)
+        else:
+            await run_blocking(self._abort)
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Execution History - Bounded in-memory execution records with on-disk spill
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class ExecutionHistory:
+    """Execution records keyed by execution id
+
+    Queued and running executions always stay in memory. Finished ones are
+    kept in an LRU bounded by max_executions and max_bytes (the size of
+    their JSON form) and, when spilling is enabled, written to an SQLite
+    file so evicted records can still be read back. Records older than
+    max_age seconds are dropped from both tiers.
+
+    Encoding and disk writes of finished records happen on a background
+    writer thread; a record joins the LRU once it has been written.
+    """
+
+    def __init__(self, history_config: Optional[Dict] = None):
+        history_config = history_config or {}
+        self.max_executions = history_config.get("max_executions", 1000)
+        self.max_age = history_config.get("max_age", 86400)
+        self.max_bytes = history_config.get("max_bytes", 64 * 1024 * 1024)
+        self.max_result_bytes = history_config.get("max_result_bytes", 0)
+        self.spill = history_config.get("spill", False)
+        self.path = history_config.get("path", "./workflows/history/executions.sqlite3")
+        self._active: Dict[str, Dict] = {}
+        # Finished records waiting for the writer thread
+        self._pending: Dict[str, Dict] = {}
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._finished: "OrderedDict[str, Tuple[float, int, Dict]]" = OrderedDict()
+        self._finished_bytes = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._completed = 0
+        self.evictions = 0
+        self.disk_reads = 0
+
+    def __setitem__(self, execution_id: str, record: Dict):
+        self._active[execution_id] = record
+
+    def __getitem__(self, execution_id: str) -> Dict:
+        record = self.get(execution_id)
+        if record is None:
+            raise KeyError(execution_id)
+        return record
+
+    def __contains__(self, execution_id: str) -> bool:
+        return self.get(execution_id) is not None
+
+    def __len__(self) -> int:
+        return len(self._active) + len(self._pending) + len(self._finished)
+
+    def get(self, execution_id: str, default: Any = None) -> Any:
+        """Get an execution record from memory, or read it back from disk"""
+        record = self._active.get(execution_id)
+        if record is not None:
+            return record
+        record = self._pending.get(execution_id)
+        if record is not None:
+            return record
+        entry = self._finished.get(execution_id)
+        if entry is not None:
+            finished_at, _, record = entry
+            if self._expired(finished_at):
+                self._drop(execution_id)
+                return default
+            self._finished.move_to_end(execution_id)
+            return record
+        if self.spill:
+            record = self._disk_get(execution_id)
+            if record is not None:
+                self.disk_reads += 1
+                return record
+        return default
+
+    def complete(self, execution_id: str):
+        """Move a finished execution out of the active set under the retention policy"""
+        record = self._active.pop(execution_id, None)
+        if record is None:
+            return
+        finished_at = time.time()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._store(execution_id, finished_at, *self._write(execution_id, record, finished_at))
+            return
+
+        # Keep the JSON encoding and the SQLite insert off the event loop
+        self._pending[execution_id] = record
+        future = loop.run_in_executor(self._get_writer(), self._write, execution_id, record, finished_at)
+        future.add_done_callback(lambda f: self._written(execution_id, finished_at, f))
+
+    def _get_writer(self) -> ThreadPoolExecutor:
+        # One thread, so writes and purges reach the file in order
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history")
+        return self._writer
+
+    def _write(self, execution_id: str, record: Dict, finished_at: float) -> Tuple[Dict, int]:
+        """Truncate and encode a finished record, spill it to disk when enabled
+
+        Works on a copy, since readers may still hold the pending record.
+        Returns the stored record and its encoded size.
+        """
+        record = self._truncate_results(record)
+        encoded = json.dumps(record, default=str)
+        if self.spill:
+            self._disk_set(execution_id, record.get("workflow_id"), finished_at, encoded)
+        return record, len(encoded)
+
+    def _written(self, execution_id: str, finished_at: float, future: asyncio.Future):
+        record = self._pending.pop(execution_id, None)
+        if record is None:
+            return
+        size = 0
+        if future.cancelled():
+            pass
+        elif future.exception() is not None:
+            logger.warning(f"Execution history write failed: {future.exception()}")
+        else:
+            record, size = future.result()
+        self._store(execution_id, finished_at, record, size)
+
+    def _store(self, execution_id: str, finished_at: float, record: Dict, size: int):
+        """Add a written record to the in-memory LRU"""
+        self._finished[execution_id] = (finished_at, size, record)
+        self._finished_bytes += size
+        self._enforce_limits()
+
+        # Expired rows are removed every so often rather than on each write
+        self._completed += 1
+        if self._completed % 100 == 0:
+            self._purge_memory()
+            if self.spill and self.max_age:
+                self._get_writer().submit(self._purge_disk)
+
+    def _truncate_results(self, record: Dict) -> Dict:
+        """Copy of a record with node outputs larger than max_result_bytes replaced by a placeholder"""
+        if not self.max_result_bytes:
+            return record
+        results = {}
+        for node_id, result in (record.get("data") or {}).items():
+            if isinstance(result, dict) and "data" in result:
+                size = len(json.dumps(result["data"], default=str))
+                if size > self.max_result_bytes:
+                    result = {**result, "data": {"truncated": True, "bytes": size}}
+            results[node_id] = result
+        return {**record, "data": results}
+
+    def _expired(self, finished_at: float) -> bool:
+        return bool(self.max_age) and time.time() - finished_at > self.max_age
+
+    def _drop(self, execution_id: str):
+        _, size, _ = self._finished.pop(execution_id)
+        self._finished_bytes -= size
+
+    def _enforce_limits(self):
+        """Evict expired records, then least recently used ones over the limits"""
+        while self._finished:
+            execution_id, (finished_at, _, _) = next(iter(self._finished.items()))
+            over_count = self.max_executions and len(self._finished) > self.max_executions
+            over_bytes = self.max_bytes and self._finished_bytes > self.max_bytes
+            if not (over_count or over_bytes or self._expired(finished_at)):
+                break
+            self._drop(execution_id)
+            self.evictions += 1
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS executions "
+                "(id TEXT PRIMARY KEY, workflow_id TEXT, finished_at REAL NOT NULL, record TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS executions_finished_at ON executions (finished_at)"
+            )
+        return self._conn
+
+    def _disk_get(self, execution_id: str) -> Optional[Dict]:
+        with self._lock:
+            try:
+                row = self._connect().execute(
+                    "SELECT record, finished_at FROM executions WHERE id = ?", (execution_id,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Execution history read failed: {e}")
+                return None
+        if row is None or self._expired(row[1]):
+            return None
+        return json.loads(row[0])
+
+    def _disk_set(self, execution_id: str, workflow_id: Optional[str], finished_at: float, encoded: str):
+        with self._lock:
+            try:
+                self._connect().execute(
+                    "INSERT OR REPLACE INTO executions (id, workflow_id, finished_at, record) VALUES (?, ?, ?, ?)",
+                    (execution_id, workflow_id, finished_at, encoded),
+                )
+            except sqlite3.Error as e:
+                logger.warning(f"Execution history write failed: {e}")
+
+    def purge_expired(self) -> int:
+        """Delete records older than max_age from both tiers, returning how many disk rows were removed"""
+        self._purge_memory()
+        return self._purge_disk()
+
+    def _purge_memory(self):
+        for execution_id in [eid for eid, (finished_at, _, _) in self._finished.items()
+                             if self._expired(finished_at)]:
+            self._drop(execution_id)
+
+    def _purge_disk(self) -> int:
+        if not (self.spill and self.max_age):
+            return 0
+        with self._lock:
+            try:
+                cursor = self._connect().execute(
+                    "DELETE FROM executions WHERE finished_at < ?", (time.time() - self.max_age,)
+                )
+            except sqlite3.Error as e:
+                logger.warning(f"Execution history purge failed: {e}")
+                return 0
+            return cursor.rowcount
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Record counts and memory use"""
+        return {
+            "active": len(self._active),
+            "pending": len(self._pending),
+            "in_memory": len(self._finished),
+            "memory_bytes": self._finished_bytes,
+            "evictions": self.evictions,
+            "disk_reads": self.disk_reads,
+        }
+
+    def close(self):
+        """Finish pending writes and close the on-disk tier"""
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+HTTP Client Pool - Shared, lifecycle-managed aiohttp session for network nodes
+"""
+
+import asyncio
+import logging
+from typing import Dict, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+class HTTPClientPool:
+    """Owns one pooled aiohttp ClientSession shared by every node of an engine
+
+    Reusing the session keeps connections alive between requests, so DNS
+    lookups and TCP/TLS handshakes are paid once per host instead of once
+    per node execution.
+    """
+
+    def __init__(self, http_config: Optional[Dict] = None):
+        http_config = http_config or {}
+        self.timeout = aiohttp.ClientTimeout(
+            total=http_config.get("timeout", 30),
+            connect=http_config.get("connect_timeout"),
+        )
+        self.limit = http_config.get("pool_limit", 100)
+        self.limit_per_host = http_config.get("pool_limit_per_host", 20)
+        self.keepalive_timeout = http_config.get("keepalive_timeout", 30)
+        self.dns_cache_ttl = http_config.get("dns_cache_ttl", 300)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Get the shared session, creating it on first use in the running loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            self._loop = loop
+            logger.debug(
+                f"Created HTTP pool (limit={self.limit}, per_host={self.limit_per_host}, "
+                f"timeout={self.timeout.total}s)"
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared session and its pooled connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Execution Journal - Write-ahead log of node progress for resuming executions
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, List, Optional, TextIO
+
+logger = logging.getLogger(__name__)
+
+def definition_hash(workflow_def: Dict) -> str:
+    """Fingerprint of a workflow definition, to detect changes before resuming"""
+    canonical = json.dumps(workflow_def, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def _snapshot(value: Any) -> Any:
+    """Shallow copy of a dict or list payload
+
+    Events are encoded later on the writer thread; copying the top level
+    keeps a downstream node that adds or replaces fields of its input
+    from changing what was checkpointed.
+    """
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+class ExecutionJournal:
+    """Append-only journal of execution events, one JSON Lines file per execution
+
+    Events are buffered in memory and written in batches at most
+    fsync_interval seconds later: a single writer thread encodes them,
+    appends them to their files and fsyncs, so the event loop never waits
+    on serialization or disk I/O and a crash loses at most that window.
+    Payloads are snapshotted (top level copied) when recorded, so nodes
+    that modify their input in place do not alter earlier checkpoints.
+    The journal of an execution is removed once it finishes; whatever is
+    left on disk after a crash describes executions that can be resumed.
+    """
+
+    def __init__(self, journal_config: Optional[Dict] = None):
+        journal_config = journal_config or {}
+        self.enabled = journal_config.get("enabled", False)
+        self.path = journal_config.get("path", "./workflows/journal")
+        self.fsync_interval = journal_config.get("fsync_interval", 0.05)
+        # Events not yet handed to the writer, by execution
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}
+        # Executions with a journal being written by this process
+        self._open: set = set()
+        # Open files, used only by the writer thread
+        self._files: Dict[str, TextIO] = {}
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._flush_handle = None
+        self._writes: set = set()
+
+    def _file_path(self, execution_id: str) -> str:
+        return os.path.join(self.path, f"{execution_id}.jsonl")
+
+    def _append(self, execution_id: str, event: Dict[str, Any]):
+        event["timestamp"] = datetime.now().isoformat()
+        self._pending.setdefault(execution_id, []).append(event)
+        self._open.add(execution_id)
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.fsync_interval, self._flush)
+
+    def _flush(self):
+        """Hand the buffered events to the writer as one batch"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._pending:
+            batch, self._pending = self._pending, {}
+            self._submit(self._write_batch, batch)
+
+    def _submit(self, call, *args):
+        # One writer thread, so batches, closes and removals happen in order
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="journal")
+        future = asyncio.get_running_loop().run_in_executor(self._writer, call, *args)
+        self._writes.add(future)
+        future.add_done_callback(self._writes.discard)
+
+    def _write_batch(self, batch: Dict[str, List[Dict[str, Any]]]):
+        """Encode, append and fsync a batch of events (writer thread)"""
+        for execution_id, events in batch.items():
+            lines = []
+            for event in events:
+                try:
+                    lines.append(json.dumps(event, default=str) + "\n")
+                except (TypeError, ValueError, RuntimeError) as e:
+                    # The node simply runs again on resume
+                    logger.warning(f"Cannot journal {event.get('event')} of execution '{execution_id}': {e}")
+            try:
+                handle = self._files.get(execution_id)
+                if handle is None:
+                    os.makedirs(self.path, exist_ok=True)
+                    handle = open(self._file_path(execution_id), "a", encoding="utf-8")
+                    self._files[execution_id] = handle
+                handle.write("".join(lines))
+                handle.flush()
+                os.fsync(handle.fileno())
+            except OSError as e:
+                logger.warning(f"Journal write failed: {e}")
+
+    def _close_all(self):
+        for execution_id in list(self._files):
+            self._close_file(execution_id, False)
+
+    def _close_file(self, execution_id: str, remove: bool):
+        """Close an execution's journal, deleting it when requested (writer thread)"""
+        handle = self._files.pop(execution_id, None)
+        if handle is not None:
+            handle.close()
+        if remove:
+            try:
+                os.remove(self._file_path(execution_id))
+            except FileNotFoundError:
+                pass
+
+    def execution_started(self, execution_id: str, workflow_id: str, workflow_def: Dict, initial_data: Any):
+        """Record the start of an execution with everything needed to rerun it"""
+        if self.enabled:
+            self._append(execution_id, {
+                "event": "execution_started",
+                "workflow_id": workflow_id,
+                "definition": definition_hash(workflow_def),
+                "initial_data": _snapshot(initial_data),
+            })
+
+    def node_started(self, execution_id: str, node_id: str):
+        """Record that a node began running"""
+        if self.enabled:
+            self._append(execution_id, {"event": "node_started", "node_id": node_id})
+
+    def node_completed(self, execution_id: str, node_id: str, result: Dict):
+        """Checkpoint a node's successful result"""
+        if self.enabled:
+            result = {**result, "data": _snapshot(result.get("data"))}
+            self._append(execution_id, {"event": "node_completed", "node_id": node_id, "result": result})
+
+    def execution_interrupted(self, execution_id: str):
+        """Close the journal of an execution that did not finish, keeping it for resume"""
+        if execution_id not in self._open:
+            return
+        self._open.discard(execution_id)
+        self._flush()
+        self._submit(self._close_file, execution_id, False)
+
+    def execution_finished(self, execution_id: str):
+        """Drop the journal of a finished execution"""
+        self._pending.pop(execution_id, None)
+        self._open.discard(execution_id)
+        if self.enabled:
+            self._submit(self._close_file, execution_id, True)
+
+    def load_incomplete(self) -> List[Dict[str, Any]]:
+        """Read the journals of executions that never finished
+
+        Each entry has the execution id, workflow id, definition hash,
+        initial data and the checkpointed results by node id. A torn last
+        line (crash mid-write) is ignored.
+        """
+        if not os.path.isdir(self.path):
+            return []
+        states = []
+        for name in sorted(os.listdir(self.path)):
+            if not name.endswith(".jsonl"):
+                continue
+            execution_id = name[:-len(".jsonl")]
+            if execution_id in self._open:
+                continue
+            state = {"id": execution_id, "completed": {}}
+            with open(os.path.join(self.path, name), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        break
+                    if event.get("event") == "execution_started":
+                        state["workflow_id"] = event.get("workflow_id")
+                        state["definition"] = event.get("definition")
+                        state["initial_data"] = event.get("initial_data")
+                    elif event.get("event") == "node_completed":
+                        state["completed"][event["node_id"]] = event["result"]
+            if "workflow_id" in state:
+                states.append(state)
+        return states
+
+    def discard(self, execution_id: str):
+        """Delete the journal of an execution that will not be resumed"""
+        try:
+            os.remove(self._file_path(execution_id))
+        except FileNotFoundError:
+            pass
+
+    async def close(self):
+        """Write outstanding events and close open journals"""
+        self._flush()
+        self._open.clear()
+        if self._writer is not None:
+            self._submit(self._close_all)
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
@@ -33,7 +33,7 @@ async def run_workflow(engine: WorkflowEngine, workflow_id: str, data: dict = No
 
 async def main():
     parser = argparse.ArgumentParser(description="Workflow Engine - Free N8N Alternative")
-    parser.add_argument("command", choices=["run", "list", "load", "status"], help="Command to execute")
+    parser.add_argument("command", choices=["run", "list", "load", "status", "resume"], help="Command to execute")
     parser.add_argument("--workflow-id", help="Workflow ID")
     parser.add_argument("--file", help="Workflow definition file")
     parser.add_argument("--data", help="Initial data (JSON string)")
@@ -79,6 +79,23 @@ async def main():
         
         await run_workflow(engine, args.workflow_id, data)
     
+    elif args.command == "resume":
+        if not args.workflow_id or not args.file:
+            print("Error: --workflow-id and --file are required")
+            sys.exit(1)
+        
+        if not engine.load_workflow_from_file(args.workflow_id, args.file):
+            print(f"Failed to load workflow '{args.workflow_id}'")
+            sys.exit(1)
+        
+        resumed = await engine.resume_executions()
+        if not resumed:
+            print("No interrupted executions to resume")
+        for execution_id in resumed:
+            print(f"Resuming execution: {execution_id}")
+            status = await engine.wait_for_execution(execution_id)
+            print(f"Status: {status['status']}")
+    
     elif args.command == "status":
         if not args.execution_id:
             print("Error: --execution-id is required")
@@ -89,6 +106,8 @@ async def main():
             print(json.dumps(status, indent=2))
         else:
             print(f"Execution '{args.execution_id}' not found")
+    
+    await engine.shutdown()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Metrics - Per-node timing and size histograms, with a Prometheus text endpoint
+"""
+
+import bisect
+import json
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+def payload_size(data: Any) -> Optional[int]:
+    """Approximate size of node data as JSON, or None when it cannot be measured (streams)"""
+    if data is None:
+        return 0
+    if isinstance(data, (bytes, str)):
+        return len(data)
+    try:
+        return len(json.dumps(data, default=str, separators=(",", ":")))
+    except (TypeError, ValueError):
+        return None
+
+class Histogram:
+    """Fixed-bucket histogram (Prometheus style, upper bounds inclusive)"""
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by interpolating inside its bucket"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                if index >= len(self.bounds):
+                    return lower
+                return lower + (self.bounds[index] - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.bounds[-1]
+
+    def summary(self) -> Dict[str, Any]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6),
+            "p50": round(self.quantile(0.5), 6),
+            "p99": round(self.quantile(0.99), 6)
+        }
+
+class NodeStats:
+    """Aggregated metrics of one node (or node type) of a workflow"""
+
+    __slots__ = ("queue_wait", "duration", "bytes_in", "bytes_out", "runs", "errors", "retries", "cache_hits")
+
+    def __init__(self):
+        self.queue_wait = Histogram(DURATION_BUCKETS)
+        self.duration = Histogram(DURATION_BUCKETS)
+        self.bytes_in = Histogram(BYTES_BUCKETS)
+        self.bytes_out = Histogram(BYTES_BUCKETS)
+        self.runs = 0
+        self.errors = 0
+        self.retries = 0
+        self.cache_hits = 0
+
+    def observe(self, metrics: Dict[str, Any], success: bool):
+        self.runs += 1
+        if not success:
+            self.errors += 1
+        self.retries += metrics.get("retries", 0)
+        self.cache_hits += metrics.get("cache_hits", 0)
+        self.queue_wait.observe(metrics.get("queue_wait_ms", 0.0) / 1000)
+        self.duration.observe(metrics.get("duration_ms", 0.0) / 1000)
+        if metrics.get("bytes_in") is not None:
+            self.bytes_in.observe(metrics["bytes_in"])
+        if metrics.get("bytes_out") is not None:
+            self.bytes_out.observe(metrics["bytes_out"])
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "errors": self.errors,
+            "retries": self.retries,
+            "cache_hits": self.cache_hits,
+            "queue_wait_seconds": self.queue_wait.summary(),
+            "duration_seconds": self.duration.summary(),
+            "bytes_in": self.bytes_in.summary(),
+            "bytes_out": self.bytes_out.summary()
+        }
+
+def count_cache_hits(result: Any) -> int:
+    """Results (or items of an items-mode result) a node served from a cache"""
+    if isinstance(result, dict):
+        return 1 if result.get("cached") is True else 0
+    if isinstance(result, list):
+        return sum(1 for item in result if isinstance(item, dict) and item.get("cached") is True)
+    return 0
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound)) if isinstance(bound, float) else str(bound)
+
+class EngineMetrics:
+    """Per-workflow node and execution metrics of an engine"""
+
+    def __init__(self, metrics_config: Optional[Dict] = None):
+        metrics_config = metrics_config or {}
+        self.enabled = metrics_config.get("enabled", True)
+        # Sizing inputs/outputs serializes them on the event loop; opt-in
+        self.measure_bytes = metrics_config.get("measure_bytes", False)
+        self.host = metrics_config.get("host", "127.0.0.1")
+        self.port = metrics_config.get("port", 9464)
+        # (workflow_id, node_id) -> (node_type, stats); (workflow_id, node_type) -> stats
+        self.nodes: Dict[Tuple[str, str], Tuple[str, NodeStats]] = {}
+        self.node_types: Dict[Tuple[str, str], NodeStats] = {}
+        # workflow_id -> {status: count}, workflow_id -> duration histogram
+        self.executions: Dict[str, Dict[str, int]] = {}
+        self.execution_durations: Dict[str, Histogram] = {}
+        self._runner: Optional[web.AppRunner] = None
+
+    def observe_node(self, workflow_id: str, node_id: str, node_type: str, metrics: Dict[str, Any], success: bool):
+        """Record one node run"""
+        if not self.enabled:
+            return
+        entry = self.nodes.get((workflow_id, node_id))
+        if entry is None:
+            entry = (node_type, NodeStats())
+            self.nodes[(workflow_id, node_id)] = entry
+        entry[1].observe(metrics, success)
+        type_stats = self.node_types.get((workflow_id, node_type))
+        if type_stats is None:
+            type_stats = self.node_types[(workflow_id, node_type)] = NodeStats()
+        type_stats.observe(metrics, success)
+
+    def observe_execution(self, workflow_id: str, status: str, seconds: Optional[float]):
+        """Record a finished execution"""
+        if not self.enabled:
+            return
+        statuses = self.executions.setdefault(workflow_id, {})
+        statuses[status] = statuses.get(status, 0) + 1
+        if seconds is not None:
+            histogram = self.execution_durations.get(workflow_id)
+            if histogram is None:
+                histogram = self.execution_durations[workflow_id] = Histogram(DURATION_BUCKETS)
+            histogram.observe(seconds)
+
+    def get_metrics(self, workflow_id: Optional[str] = None) -> Dict[str, Any]:
+        """Aggregated metrics per workflow, by node and by node type"""
+        workflows: Dict[str, Dict[str, Any]] = {}
+
+        def workflow_entry(wf_id: str) -> Dict[str, Any]:
+            return workflows.setdefault(wf_id, {"executions": {}, "nodes": {}, "node_types": {}})
+
+        for wf_id, statuses in self.executions.items():
+            if workflow_id is None or wf_id == workflow_id:
+                entry = workflow_entry(wf_id)
+                entry["executions"] = dict(statuses)
+                entry["execution_duration_seconds"] = self.execution_durations[wf_id].summary() \
+                    if wf_id in self.execution_durations else {"count": 0}
+        for (wf_id, node_id), (node_type, stats) in self.nodes.items():
+            if workflow_id is None or wf_id == workflow_id:
+                workflow_entry(wf_id)["nodes"][node_id] = {"type": node_type, **stats.summary()}
+        for (wf_id, node_type), stats in self.node_types.items():
+            if workflow_id is None or wf_id == workflow_id:
+                workflow_entry(wf_id)["node_types"][node_type] = stats.summary()
+        return {"workflows": workflows}
+
+    def to_prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format"""
+        lines = []
+
+        def histogram(name: str, help_text: str, series):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, hist in series:
+                cumulative = 0
+                for bound, bucket_count in zip(hist.bounds, hist.counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{{{labels},le="{_format_bound(bound)}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {hist.count}')
+                lines.append(f"{name}_sum{{{labels}}} {hist.sum}")
+                lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+        def counter(name: str, help_text: str, series):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in series:
+                lines.append(f"{name}{{{labels}}} {value}")
+
+        node_series = [
+            (_labels(workflow=wf_id, node=node_id, type=node_type), stats)
+            for (wf_id, node_id), (node_type, stats) in self.nodes.items()
+        ]
+        histogram("workflow_node_queue_wait_seconds", "Time a ready node waited for a concurrency slot",
+                  [(labels, stats.queue_wait) for labels, stats in node_series])
+        histogram("workflow_node_duration_seconds", "Node execution time, retries included",
+                  [(labels, stats.duration) for labels, stats in node_series])
+        histogram("workflow_node_input_bytes", "Size of node input as JSON",
+                  [(labels, stats.bytes_in) for labels, stats in node_series])
+        histogram("workflow_node_output_bytes", "Size of node output as JSON",
+                  [(labels, stats.bytes_out) for labels, stats in node_series])
+        counter("workflow_node_runs_total", "Node runs", [(labels, stats.runs) for labels, stats in node_series])
+        counter("workflow_node_errors_total", "Failed node runs",
+                [(labels, stats.errors) for labels, stats in node_series])
+        counter("workflow_node_retries_total", "Node retries",
+                [(labels, stats.retries) for labels, stats in node_series])
+        counter("workflow_node_cache_hits_total", "Node results served from a cache",
+                [(labels, stats.cache_hits) for labels, stats in node_series])
+        counter("workflow_executions_total", "Finished executions", [
+            (_labels(workflow=wf_id, status=status), count)
+            for wf_id, statuses in self.executions.items()
+            for status, count in statuses.items()
+        ])
+        histogram("workflow_execution_duration_seconds", "Execution time from start to finish", [
+            (_labels(workflow=wf_id), hist) for wf_id, hist in self.execution_durations.items()
+        ])
+        return "\n".join(lines) + "\n"
+
+    async def start_server(self, host: Optional[str] = None, port: Optional[int] = None) -> str:
+        """Serve GET /metrics (Prometheus text) and GET /metrics.json; returns the base URL"""
+        if self._runner is not None:
+            raise RuntimeError("Metrics server already running")
+
+        async def prometheus(request: web.Request) -> web.Response:
+            return web.Response(text=self.to_prometheus(), content_type="text/plain", charset="utf-8")
+
+        async def as_json(request: web.Request) -> web.Response:
+            return web.json_response(self.get_metrics(request.query.get("workflow")))
+
+        app = web.Application()
+        app.router.add_get("/metrics", prometheus)
+        app.router.add_get("/metrics.json", as_json)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host or self.host, self.port if port is None else port)
+        await site.start()
+        bound_host, bound_port = site._server.sockets[0].getsockname()[:2]
+        url = f"http://{bound_host}:{bound_port}"
+        logger.info(f"Metrics available at {url}/metrics")
+        return url
+
+    async def stop_server(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
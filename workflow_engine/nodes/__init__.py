@@ -12,6 +12,7 @@ from workflow_engine.nodes.youtube_node import YouTubeNode
 from workflow_engine.nodes.database_node import DatabaseNode
 from workflow_engine.nodes.image_node import ImageNode
 from workflow_engine.nodes.voiceover_node import VoiceoverNode
+from workflow_engine.nodes.map_node import MapNode
 
 __all__ = [
     "BaseNode",
@@ -24,4 +25,5 @@ __all__ = [
     "DatabaseNode",
     "ImageNode",
     "VoiceoverNode",
+    "MapNode",
 ]
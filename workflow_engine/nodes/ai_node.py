@@ -3,7 +3,6 @@
 AI Node - Interact with AI APIs (OpenRouter, OpenAI, etc.)
 """
 
-import aiohttp
 from typing import Dict, Any
 import json
 
@@ -34,10 +33,10 @@ class AINode(BaseNode):
         
         # Prepare messages
         if not messages and prompt:
-            # Simple template replacement for {{$json.field}} syntax
-            if isinstance(input_data, dict):
-                for key, value in input_data.items():
-                    prompt = prompt.replace(f"{{{{$json.{key}}}}}", str(value))
+            # {{$json...}} templates were rendered by get_parameter; a prompt
+            # that is a single reference may resolve to structured data
+            if not isinstance(prompt, str):
+                prompt = json.dumps(prompt, ensure_ascii=False, default=str)
             messages = [{"role": "user", "content": prompt}]
         elif not messages:
             # Try to extract from input_data
@@ -48,9 +47,10 @@ class AINode(BaseNode):
             else:
                 messages = [{"role": "user", "content": str(input_data)}]
         
-        # Prepare request
+        # Prepare request ("base_url" points at a compatible proxy or stand-in)
+        base_url = self.get_parameter("base_url")
         if provider == "openrouter":
-            url = "https://openrouter.ai/api/v1/chat/completions"
+            url = f"{base_url or 'https://openrouter.ai/api/v1'}/chat/completions"
             headers = {
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json",
@@ -64,7 +64,7 @@ class AINode(BaseNode):
                 "max_tokens": max_tokens
             }
         elif provider == "openai":
-            url = "https://api.openai.com/v1/chat/completions"
+            url = f"{base_url or 'https://api.openai.com/v1'}/chat/completions"
             headers = {
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json"
@@ -78,26 +78,46 @@ class AINode(BaseNode):
         else:
             raise ValueError(f"Unknown provider: {provider}")
         
+        # Serve identical requests from the response cache when enabled
+        cache_key = None
+        cache_policy = self.get_cache_policy()
+        if cache_policy is not None and not (
+            cache_policy.get("bypass_when_nondeterministic") and temperature > 0
+        ):
+            cache_key = self.response_cache.make_key(
+                "ai",
+                provider=provider,
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            cached = await self.response_cache.get(cache_key)
+            if cached is not None:
+                return {**cached, "cached": True}
+        
         # Make request
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=payload) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise Exception(f"AI API error: {response.status} - {error_text}")
-                
-                result = await response.json()
-                
-                # Extract response
-                if "choices" in result and len(result["choices"]) > 0:
-                    content = result["choices"][0]["message"]["content"]
-                    return {
-                        "response": content,
-                        "full_response": result,
-                        "model": model,
-                        "usage": result.get("usage", {})
-                    }
-                else:
-                    return {
-                        "response": str(result),
-                        "full_response": result
-                    }
+        async with self.http_request("POST", url, credential=api_key, headers=headers, json=payload) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                raise Exception(f"AI API error: {response.status} - {error_text}")
+            
+            result = await response.json()
+            
+            # Extract response
+            if "choices" in result and len(result["choices"]) > 0:
+                content = result["choices"][0]["message"]["content"]
+                output = {
+                    "response": content,
+                    "full_response": result,
+                    "model": model,
+                    "usage": result.get("usage", {})
+                }
+                if cache_key:
+                    await self.response_cache.set(cache_key, output, cache_policy.get("ttl"))
+                return output
+            else:
+                return {
+                    "response": str(result),
+                    "full_response": result
+                }
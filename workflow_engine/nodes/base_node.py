@@ -3,30 +3,255 @@
 Base Node - Base class for all workflow nodes
 """
 
+import asyncio
+import hashlib
+import json
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from workflow_engine import expressions
+from workflow_engine.resilience import RetryPolicy, HTTPStatusError, parse_retry_after
+
+def to_items(data: Any) -> List[Any]:
+    """Get the list of records carried by node data (items mode)
+    
+    Lists are used as-is, outputs such as DatabaseNode's {"records": [...]}
+    or {"items": [...]} are unwrapped, and anything else is a single item.
+    """
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        for key in ("items", "records"):
+            if isinstance(data.get(key), list):
+                return data[key]
+    return [data]
 
 class BaseNode(ABC):
     """Base class for all workflow nodes"""
     
+    # Whether execute() accepts an async iterator of records as input;
+    # other nodes receive streamed input fully materialized as a list
+    accepts_stream = False
+    
+    # Where the engine runs the node: "io" on the event loop, "thread" in a
+    # thread pool, "cpu" in a process pool. Overridable per node definition.
+    execution_class = "io"
+    
+    # Parameters the node parses itself rather than as {{...}} templates
+    raw_parameters = ()
+    
+    # Shared services, injected by the engine
+    http_pool = None
+    response_cache = None
+    write_batcher = None
+    subworkflow_runner = None
+    circuit_breakers = None
+    rate_limiters = None
+    
     def __init__(self, node_config: Dict, config_manager=None):
         self.node_config = node_config
         self.config_manager = config_manager
         self.node_id = node_config.get("id", "unknown")
         self.node_name = node_config.get("name", self.node_id)
         self.parameters = node_config.get("parameters", {})
+        # {{...}} templates are parsed once per node, rendered per call
+        self._templates = expressions.compile_parameters(self.parameters, self.raw_parameters)
+        self.retry_policy = RetryPolicy.from_node(node_config)
+    
+    async def setup(self):
+        """Prepare warm state (connections, compiled templates) before the first execute
+        
+        Node instances are created once per loaded workflow and reused by
+        every execution, so execute() must not keep per-call state on self.
+        """
+        pass
+    
+    async def teardown(self):
+        """Release warm state when the workflow is replaced or the engine shuts down"""
+        pass
     
     @abstractmethod
     async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the node with input data"""
         pass
     
+    def run_sync(self, input_data: Any) -> Any:
+        """Execute the node synchronously in a worker thread or process
+        
+        Used for "thread" and "cpu" execution classes. Nodes doing blocking
+        or CPU-bound work override this with a plain function; the default
+        runs execute() on a private event loop.
+        """
+        return asyncio.run(self.execute(input_data))
+    
+    def get_branch(self, output: Any) -> Optional[str]:
+        """Get the branch label an output is routed to
+        
+        Connections labeled with another branch are not followed; None (the
+        default) follows every connection.
+        """
+        return None
+    
+    def get_execution_class(self) -> str:
+        """Get the node's execution class ("io", "thread" or "cpu")"""
+        return self.node_config.get("execution_class", self.execution_class)
+    
+    async def execute_batch(self, items: List[Any]) -> List[Any]:
+        """Execute the node over a list of records (items mode)
+        
+        Nodes that can process a whole column at once override this; the
+        default runs execute() per item, with up to "batch_concurrency"
+        items in flight (1 by default, preserving order of side effects).
+        """
+        concurrency = self.get_parameter("batch_concurrency", 1)
+        if concurrency <= 1:
+            results = []
+            for item in items:
+                # $json refers to the record being processed
+                with expressions.bound(item):
+                    results.append(await self.execute(item))
+            return results
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def run(item):
+            async with semaphore:
+                with expressions.bound(item):
+                    return await self.execute(item)
+        
+        return list(await asyncio.gather(*(run(item) for item in items)))
+    
     def get_parameter(self, key: str, default: Any = None) -> Any:
-        """Get a parameter value"""
-        return self.parameters.get(key, default)
+        """Get a parameter value, with {{$json...}} / {{$node...}} templates rendered
+        
+        Templates are rendered against the input of the running execution;
+        a reference that resolves to nothing gives the default.
+        """
+        template = self._templates.get(key)
+        if template is None:
+            return self.parameters.get(key, default)
+        value = expressions.render(template, self.parameters[key])
+        return default if value is None else value
+    
+    def has_templates(self) -> bool:
+        """Whether any parameter contains a {{...}} template
+        
+        Column-at-once execute_batch overrides read parameters once per
+        batch, so they fall back to the per-item default when it does.
+        """
+        return bool(self._templates)
+    
+    def render_parameters(self) -> Dict[str, Any]:
+        """Get every parameter with its templates rendered"""
+        return {key: self.get_parameter(key) for key in self.parameters}
+    
+    def node_references(self) -> set:
+        """Ids of the nodes whose outputs the parameters refer to ($node)"""
+        references = set()
+        for template in self._templates.values():
+            references |= template.node_references()
+        return references
     
     def get_config_value(self, key: str, default: Any = None) -> Any:
         """Get a value from config manager"""
         if self.config_manager:
             return self.config_manager.get_credential(key)
         return default
+    
+    def get_cache_policy(self) -> Optional[Dict[str, Any]]:
+        """Get the node's response cache policy, or None when caching is off
+        
+        Enabled with the "cache" parameter: either true or an object with
+        "ttl" (seconds) and "bypass_when_nondeterministic" (skip the cache
+        when temperature > 0).
+        """
+        policy = self.get_parameter("cache", False)
+        if not policy or self.response_cache is None:
+            return None
+        return policy if isinstance(policy, dict) else {}
+    
+    def get_coalesce_key(self, input_data: Any) -> Optional[str]:
+        """Get the key under which identical in-flight calls are coalesced
+        
+        Enabled with the "coalesce" parameter: true keys on the node's
+        parameters and full input, {"key_fields": [...]} keys on the
+        parameters and only the listed input fields. Returns None when
+        coalescing is off.
+        """
+        policy = self.get_parameter("coalesce", False)
+        if not policy:
+            return None
+        key_fields = policy.get("key_fields") if isinstance(policy, dict) else None
+        if key_fields is not None and isinstance(input_data, dict):
+            keyed_input = {field: input_data.get(field) for field in key_fields}
+        else:
+            keyed_input = input_data
+        canonical = json.dumps(
+            [type(self).__qualname__, self.render_parameters(), keyed_input],
+            sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    
+    @asynccontextmanager
+    async def http_request(self, method: str, url: str, credential: Optional[str] = None, **kwargs):
+        """Make an HTTP request, using the engine's pooled session when available
+        
+        The request first waits for the host's rate limit (per credential,
+        usually the API key sent with it), then consults the host's circuit
+        breaker and tells it the outcome. When the node declares retries, a
+        response with a retryable status raises HTTPStatusError so the engine
+        can retry the node.
+        """
+        host = urlsplit(url).netloc
+        bucket = self.rate_limiters.get(host, credential) if self.rate_limiters is not None else None
+        if bucket is not None:
+            await bucket.acquire()
+        
+        breaker = self.circuit_breakers.get(host) if self.circuit_breakers is not None else None
+        if breaker is not None:
+            breaker.before_request()
+        
+        recorded = False
+        try:
+            async with self._session_request(method, url, **kwargs) as response:
+                if breaker is not None:
+                    if response.status >= 500 or response.status == 429:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                recorded = True
+                
+                if bucket is not None and response.status == 429:
+                    bucket.pause(parse_retry_after(response.headers.get("Retry-After")) or 1.0)
+                
+                policy = self.retry_policy
+                if policy is not None and policy.max_retries and response.status in policy.retry_on:
+                    error_text = (await response.text())[:200]
+                    raise HTTPStatusError(
+                        response.status, host,
+                        f"HTTP {response.status} from {host}: {error_text}",
+                        retry_after=parse_retry_after(response.headers.get("Retry-After")),
+                    )
+                yield response
+        except BaseException as e:
+            if breaker is not None and not recorded:
+                if isinstance(e, Exception):
+                    breaker.record_failure()
+                else:
+                    breaker.record_abandoned()
+            raise
+    
+    @asynccontextmanager
+    async def _session_request(self, method: str, url: str, **kwargs):
+        if self.http_pool is not None:
+            session = self.http_pool.get_session()
+            async with session.request(method, url, **kwargs) as response:
+                yield response
+        else:
+            async with aiohttp.ClientSession() as session:
+                async with session.request(method, url, **kwargs) as response:
+                    yield response
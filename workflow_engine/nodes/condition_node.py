@@ -3,58 +3,173 @@
 Condition Node - Conditional logic and branching
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Callable, Optional
 
 from workflow_engine.nodes.base_node import BaseNode
 
-class ConditionNode(BaseNode):
-    """Node for conditional logic"""
+def _to_float(value: Any):
+    """Convert to float, or None when not numeric"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def build_predicate(condition_type: str, value: Any) -> Callable[[Any], bool]:
+    """Build a callable testing a field value, converting the expected value once"""
+    if condition_type in ("equals", "not_equals"):
+        expected = str(value)
+        # Booleans match "true"/"false" in any case
+        expected_lower = expected.lower()
+        def equals(field_value):
+            if isinstance(field_value, bool):
+                return str(field_value).lower() == expected_lower
+            return str(field_value) == expected
+        if condition_type == "equals":
+            return equals
+        return lambda field_value: not equals(field_value)
+    elif condition_type in ("greater_than", "less_than"):
+        expected = _to_float(value)
+        if expected is None:
+            return lambda field_value: False
+        if condition_type == "greater_than":
+            def predicate(field_value):
+                number = _to_float(field_value)
+                return number is not None and number > expected
+        else:
+            def predicate(field_value):
+                number = _to_float(field_value)
+                return number is not None and number < expected
+        return predicate
+    elif condition_type == "contains":
+        expected = str(value)
+        return lambda field_value: expected in str(field_value)
+    elif condition_type == "not_contains":
+        expected = str(value)
+        return lambda field_value: expected not in str(field_value)
+    elif condition_type == "exists":
+        return lambda field_value: field_value is not None
+    elif condition_type == "not_exists":
+        return lambda field_value: field_value is None
+    raise ValueError(f"Unknown condition type: {condition_type}")
+
+def field_getter(field: str) -> Callable[[Any], Any]:
+    """Build a callable reading a field, or a dotted path ("video.stats.views"), from the input
+
+    A key containing the dots literally takes precedence. Non-dict input is
+    tested as a whole.
+    """
+    if not field:
+        return lambda data: None
+    if "." not in field:
+        return lambda data: data.get(field) if isinstance(data, dict) else data
+    path = tuple(int(key) if key.isdigit() else key for key in field.split("."))
     
-    async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute condition"""
-        condition_type = self.get_parameter("condition_type", "equals")
-        field = self.get_parameter("field", "")
-        value = self.get_parameter("value", "")
-        
-        # Get field value from input
-        field_value = None
-        if field:
-            if isinstance(input_data, dict):
-                field_value = input_data.get(field)
+    def get(data):
+        if not isinstance(data, dict):
+            return data
+        if field in data:
+            return data[field]
+        value = data
+        for key in path:
+            if isinstance(value, dict):
+                value = value.get(str(key))
+            elif isinstance(value, list) and isinstance(key, int) and key < len(value):
+                value = value[key]
             else:
-                field_value = input_data
-        
-        # Evaluate condition
-        result = False
-        
-        if condition_type == "equals":
-            result = str(field_value) == str(value)
-        elif condition_type == "not_equals":
-            result = str(field_value) != str(value)
-        elif condition_type == "greater_than":
-            try:
-                result = float(field_value) > float(value)
-            except:
-                result = False
-        elif condition_type == "less_than":
-            try:
-                result = float(field_value) < float(value)
-            except:
-                result = False
-        elif condition_type == "contains":
-            result = str(value) in str(field_value)
-        elif condition_type == "not_contains":
-            result = str(value) not in str(field_value)
-        elif condition_type == "exists":
-            result = field_value is not None
-        elif condition_type == "not_exists":
-            result = field_value is None
-        
+                return None
+        return value
+    return get
+
+def compile_condition(spec: Dict[str, Any]) -> Callable[[Any], bool]:
+    """Compile a condition into a predicate over the node input
+
+    A condition is {"field", "condition_type", "value"}, or a compound
+    {"and": [...]}, {"or": [...]} or {"not": {...}} of conditions.
+    Raises ValueError for malformed conditions.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError(f"Invalid condition: {spec!r}")
+    if "and" in spec or "or" in spec:
+        operator = "and" if "and" in spec else "or"
+        parts = spec[operator]
+        if not isinstance(parts, list) or not parts:
+            raise ValueError(f"'{operator}' needs a non-empty list of conditions")
+        predicates = tuple(compile_condition(part) for part in parts)
+        if operator == "and":
+            return lambda data: all(predicate(data) for predicate in predicates)
+        return lambda data: any(predicate(data) for predicate in predicates)
+    if "not" in spec:
+        inner = compile_condition(spec["not"])
+        return lambda data: not inner(data)
+    get = field_getter(spec.get("field", ""))
+    test = build_predicate(spec.get("condition_type", "equals"), spec.get("value", ""))
+    return lambda data: test(get(data))
+
+# Parameters the predicate is compiled from
+CONDITION_PARAMETERS = ("condition", "conditions", "combine", "field", "condition_type", "value")
+
+class ConditionNode(BaseNode):
+    """Node for conditional logic
+    
+    The result is routed: connections labeled "true" or "false" are only
+    followed when the condition has that outcome.
+    """
+
+    def __init__(self, node_config: Dict, config_manager=None):
+        super().__init__(node_config, config_manager)
+        # Compiled once, unless the condition is built from {{...}} templates
+        self._predicate = None
+        if not any(key in self._templates for key in CONDITION_PARAMETERS):
+            self._predicate = compile_condition(self._condition_spec())
+
+    def _condition_spec(self) -> Dict[str, Any]:
+        """The condition described by the parameters"""
+        condition = self.get_parameter("condition")
+        if condition:
+            return condition
+        conditions = self.get_parameter("conditions")
+        if conditions:
+            return {self.get_parameter("combine", "and"): conditions}
+        return {
+            "field": self.get_parameter("field", ""),
+            "condition_type": self.get_parameter("condition_type", "equals"),
+            "value": self.get_parameter("value", "")
+        }
+
+    def _get_predicate(self) -> Callable[[Any], bool]:
+        if self._predicate is not None:
+            return self._predicate
+        return compile_condition(self._condition_spec())
+
+    def _result(self, result: bool, field: str, field_value: Any, input_data: Any) -> Dict[str, Any]:
         return {
             "condition_result": result,
             "field": field,
             "field_value": field_value,
-            "expected_value": value,
-            "condition_type": condition_type,
+            "expected_value": self.get_parameter("value", ""),
+            "condition_type": self.get_parameter("condition_type", "equals"),
             "data": input_data
         }
+
+    def get_branch(self, output: Any) -> Optional[str]:
+        """Route to the "true" or "false" connections"""
+        if isinstance(output, dict) and "condition_result" in output:
+            return "true" if output["condition_result"] else "false"
+        return None
+
+    async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute condition"""
+        field = self.get_parameter("field", "")
+        result = self._get_predicate()(input_data)
+        return self._result(result, field, field_getter(field)(input_data), input_data)
+
+    async def execute_batch(self, items: List[Any]) -> List[Dict[str, Any]]:
+        """Evaluate the condition over a whole list of records"""
+        if self.has_templates():
+            # Templated parameters render against each record in turn
+            return await super().execute_batch(items)
+        field = self.get_parameter("field", "")
+        get_field = field_getter(field)
+        predicate = self._get_predicate()
+
+        return [self._result(predicate(item), field, get_field(item), item) for item in items]
@@ -3,99 +3,100 @@
 Database Node - Simple file-based database operations
 """
 
-import json
 import os
 from typing import Dict, Any, List
-from datetime import datetime
 
+from workflow_engine.file_io import run_blocking
 from workflow_engine.nodes.base_node import BaseNode
+from workflow_engine.storage import StorageBackend, get_backend, table_cache
 
 class DatabaseNode(BaseNode):
     """Node for database operations (file-based for simplicity)"""
     
     def __init__(self, node_config: Dict, config_manager=None):
         super().__init__(node_config, config_manager)
-        # Get storage path from config
+        # Get storage path and backend from config
+        database_config = {}
         if config_manager:
             config = config_manager.get_config()
             self.storage_path = config.get("workflows", {}).get("storage_path", "./workflows/data")
+            database_config = config.get("database", {})
         else:
             self.storage_path = "./workflows/data"
         os.makedirs(self.storage_path, exist_ok=True)
+        
+        self.backend_name = self.get_parameter("backend", database_config.get("backend", "json"))
+        indexes = list(database_config.get("indexes", [])) + list(self.get_parameter("indexes", []))
+        for key_param in ("filter_key", "check_key"):
+            if self.get_parameter(key_param):
+                indexes.append(self.get_parameter(key_param))
+        self.indexes = indexes
+        self.batch_writes = self.get_parameter("batch_writes", database_config.get("batch_writes", False))
+        if "cache_max_bytes" in database_config:
+            table_cache.max_bytes = database_config["cache_max_bytes"]
+    
+    def get_backend(self) -> StorageBackend:
+        """Get the shared storage backend for this node's storage path"""
+        return get_backend(self.backend_name, self.storage_path, self.indexes)
+    
+    def _check_exists(self, backend: StorageBackend, table_name: str, check_key: str, check_value: Any):
+        """Look a record up by check_key, falling back to its url"""
+        record = backend.find_one(table_name, check_key, check_value)
+        if record is None and check_key != "url":
+            record = backend.find_one(table_name, "url", check_value)
+        return record
     
     async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute database operation"""
         operation = self.get_parameter("operation", "read")
         table_name = self.get_parameter("table", "default")
-        file_path = os.path.join(self.storage_path, f"{table_name}.json")
+        
+        if operation == "cache_stats":
+            # Parsed-table cache counters (json backend)
+            return table_cache.get_stats()
+        
+        # Backend calls read, parse and write files; keep them off the event loop
+        backend = await run_blocking(self.get_backend)
         
         if operation == "read":
             # Read all records
-            if os.path.exists(file_path):
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                return {
-                    "records": data,
-                    "count": len(data)
-                }
-            return {"records": [], "count": 0}
+            data = await run_blocking(backend.read_all, table_name)
+            return {
+                "records": data,
+                "count": len(data)
+            }
         
         elif operation == "read_one":
             # Read one record by filter
             filter_key = self.get_parameter("filter_key", "id")
             filter_value = self.get_parameter("filter_value")
             
-            if os.path.exists(file_path):
-                with open(file_path, 'r') as f:
-                    records = json.load(f)
-                
-                for record in records:
-                    if record.get(filter_key) == filter_value:
-                        return {"record": record, "found": True}
+            record = await run_blocking(backend.find_one, table_name, filter_key, filter_value)
+            if record is not None:
+                return {"record": record, "found": True}
             
             return {"record": None, "found": False}
         
         elif operation == "write":
             # Write/update record
             record = input_data.get("record", input_data)
-            record_id = record.get("id") or record.get("video_id") or record.get("url")
-            
-            if not os.path.exists(file_path):
-                records = []
+            if self.batch_writes and self.write_batcher is not None:
+                # Applied together with other writes to this table
+                stored, updated = await self.write_batcher.submit(backend, table_name, record)
             else:
-                with open(file_path, 'r') as f:
-                    records = json.load(f)
-            
-            # Update or add
-            updated = False
-            for i, r in enumerate(records):
-                if r.get("id") == record_id or r.get("video_id") == record_id or r.get("url") == record_id:
-                    records[i] = {**r, **record, "id": record_id, "updated_at": datetime.now().isoformat()}
-                    updated = True
-                    break
-            
-            if not updated:
-                record["id"] = record_id
-                record["created_at"] = datetime.now().isoformat()
-                records.append(record)
+                stored, updated = await run_blocking(backend.upsert, table_name, record)
             
-            with open(file_path, 'w') as f:
-                json.dump(records, f, indent=2)
-            
-            return {"success": True, "record": record, "updated": updated}
+            # Inserts report the record with its stamped id and created_at
+            return {"success": True, "record": record if updated else stored, "updated": updated}
         
         elif operation == "check_exists":
             # Check if record exists
             check_key = self.get_parameter("check_key", "url")
             check_value = input_data.get(check_key) or input_data.get("url") or str(input_data)
             
-            if os.path.exists(file_path):
-                with open(file_path, 'r') as f:
-                    records = json.load(f)
-                
-                for record in records:
-                    if record.get(check_key) == check_value or record.get("url") == check_value:
-                        return {"exists": True, "record": record}
+            record = await run_blocking(self._check_exists, backend, table_name, check_key, check_value)
+            if record is not None:
+                return {"exists": True, "record": record}
             
             return {"exists": False}
         
@@ -104,14 +105,26 @@ class DatabaseNode(BaseNode):
             filter_key = self.get_parameter("filter_key", "status")
             filter_value = self.get_parameter("filter_value", "pending")
             
-            if os.path.exists(file_path):
-                with open(file_path, 'r') as f:
-                    records = json.load(f)
-                
-                filtered = [r for r in records if r.get(filter_key) == filter_value]
-                return {"records": filtered, "count": len(filtered)}
-            
-            return {"records": [], "count": 0}
+            filtered = await run_blocking(backend.find, table_name, filter_key, filter_value)
+            return {"records": filtered, "count": len(filtered)}
         
         else:
             return input_data
+    
+    async def execute_batch(self, items: List[Any]) -> List[Any]:
+        """Write a whole list of records in one table write (items mode)"""
+        if self.has_templates() or self.get_parameter("operation", "read") != "write":
+            return await super().execute_batch(items)
+        
+        table_name = self.get_parameter("table", "default")
+        backend = await run_blocking(self.get_backend)
+        records = [item.get("record", item) for item in items]
+        if self.batch_writes and self.write_batcher is not None:
+            results = await self.write_batcher.submit_many(backend, table_name, records)
+        else:
+            results = await run_blocking(backend.upsert_many, table_name, records)
+        
+        return [
+            {"success": True, "record": record if updated else stored, "updated": updated}
+            for record, (stored, updated) in zip(records, results)
+        ]
@@ -3,8 +3,7 @@
 HTTP Node - Make HTTP requests
 """
 
-import aiohttp
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import json
 
 from workflow_engine.nodes.base_node import BaseNode
@@ -12,11 +11,19 @@ from workflow_engine.nodes.base_node import BaseNode
 class HTTPNode(BaseNode):
     """Node for making HTTP requests"""
     
+    def get_coalesce_key(self, input_data: Any) -> Optional[str]:
+        """Only coalesce safe requests unless explicitly allowed"""
+        method = self.get_parameter("method", "GET").upper()
+        policy = self.get_parameter("coalesce", False)
+        if method not in ("GET", "HEAD") and not (isinstance(policy, dict) and policy.get("unsafe")):
+            return None
+        return super().get_coalesce_key(input_data)
+    
     async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute HTTP request"""
         method = self.get_parameter("method", "GET").upper()
         url = self.get_parameter("url", "")
-        headers = self.get_parameter("headers", {})
+        headers = dict(self.get_parameter("headers", {}))
         body = self.get_parameter("body", {})
         auth_type = self.get_parameter("authentication", "none")
         
@@ -24,14 +31,17 @@ class HTTPNode(BaseNode):
             raise ValueError("URL is required for HTTP node")
         
         # Handle authentication
+        credential = None
         if auth_type == "bearer":
             token = self.get_config_value("bearer_token") or self.get_parameter("bearer_token")
             if token:
                 headers["Authorization"] = f"Bearer {token}"
+                credential = token
         elif auth_type == "basic":
             username = self.get_parameter("username") or self.get_config_value("http_username")
             password = self.get_parameter("password") or self.get_config_value("http_password")
             if username and password:
+                credential = username
                 import base64
                 credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
                 headers["Authorization"] = f"Basic {credentials}"
@@ -46,23 +56,23 @@ class HTTPNode(BaseNode):
                 headers.setdefault("Content-Type", "application/json")
         
         # Make request
-        async with aiohttp.ClientSession() as session:
-            async with session.request(
-                method=method,
-                url=url,
-                headers=headers,
-                data=body_data
-            ) as response:
-                response_data = {
-                    "status": response.status,
-                    "headers": dict(response.headers),
-                    "body": await response.text()
-                }
-                
-                # Try to parse JSON
-                try:
-                    response_data["json"] = await response.json()
-                except:
-                    pass
-                
-                return response_data
+        async with self.http_request(
+            method,
+            url,
+            credential=credential,
+            headers=headers,
+            data=body_data
+        ) as response:
+            response_data = {
+                "status": response.status,
+                "headers": dict(response.headers),
+                "body": await response.text()
+            }
+            
+            # Try to parse JSON
+            try:
+                response_data["json"] = await response.json()
+            except:
+                pass
+            
+            return response_data
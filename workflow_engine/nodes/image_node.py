@@ -3,7 +3,6 @@
 Image Generation Node - Generate images using AI
 """
 
-import aiohttp
 from typing import Dict, Any
 import json
 
@@ -71,30 +70,48 @@ class ImageNode(BaseNode):
             "max_tokens": 200
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=payload) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise Exception(f"Image generation API error: {response.status} - {error_text}")
-                
-                result = await response.json()
+        # Serve identical requests from the response cache when enabled
+        cache_key = None
+        cache_policy = self.get_cache_policy()
+        if cache_policy is not None:
+            cache_key = self.response_cache.make_key(
+                "image",
+                provider=provider,
+                model=payload["model"],
+                messages=payload["messages"],
+                max_tokens=payload["max_tokens"],
+                num_images=num_images
+            )
+            cached = await self.response_cache.get(cache_key)
+            if cached is not None:
+                return {**cached, "cached": True}
+        
+        async with self.http_request("POST", url, credential=api_key, headers=headers, json=payload) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                raise Exception(f"Image generation API error: {response.status} - {error_text}")
+            
+            result = await response.json()
+            
+            if "choices" in result and len(result["choices"]) > 0:
+                description = result["choices"][0]["message"]["content"]
                 
-                if "choices" in result and len(result["choices"]) > 0:
-                    description = result["choices"][0]["message"]["content"]
-                    
-                    # Return image description (in production, this would be actual image URLs)
-                    return {
-                        "image_description": description,
-                        "prompt": prompt,
-                        "images": [
-                            {
-                                "url": f"generated_image_{i}.png",  # Placeholder
-                                "description": description,
-                                "prompt": prompt
-                            }
-                            for i in range(num_images)
-                        ],
-                        "note": "For actual image generation, integrate with Stability AI, Hugging Face, or Replicate API"
-                    }
+                # Return image description (in production, this would be actual image URLs)
+                output = {
+                    "image_description": description,
+                    "prompt": prompt,
+                    "images": [
+                        {
+                            "url": f"generated_image_{i}.png",  # Placeholder
+                            "description": description,
+                            "prompt": prompt
+                        }
+                        for i in range(num_images)
+                    ],
+                    "note": "For actual image generation, integrate with Stability AI, Hugging Face, or Replicate API"
+                }
+                if cache_key:
+                    await self.response_cache.set(cache_key, output, cache_policy.get("ttl"))
+                return output
         
         return {"error": "Image generation failed"}
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Map Node - Fan a list out to a sub-workflow with bounded parallelism
+"""
+
+import asyncio
+from typing import Dict, Any, List, AsyncIterator
+
+from workflow_engine.nodes.base_node import BaseNode, to_items
+from workflow_engine.streams import is_async_iterable
+
+class MapNode(BaseNode):
+    """Node that splits a list into chunks and runs a sub-workflow per element
+
+    Elements are processed with at most `concurrency` sub-workflow runs in
+    flight, and results are gathered in input order. Without a sub-workflow
+    the node only splits its input into chunks (split-in-batches).
+    """
+
+    accepts_stream = True
+
+    async def _iter_elements(self, input_data: Any) -> AsyncIterator[Any]:
+        """Iterate the elements to map over"""
+        items_field = self.get_parameter("items_field", "")
+        if is_async_iterable(input_data):
+            async for element in input_data:
+                yield element
+            return
+        if items_field and isinstance(input_data, dict):
+            elements = input_data.get(items_field) or []
+        else:
+            elements = to_items(input_data)
+        for element in elements:
+            yield element
+
+    async def _run_element(self, workflow_id: str, index: int, element: Any) -> Any:
+        """Run the sub-workflow for one element, capturing its failure"""
+        try:
+            return await self.subworkflow_runner(workflow_id, element)
+        except Exception as e:
+            return {"index": index, "error": str(e)}
+
+    async def _iter_chunks(self, input_data: Any) -> AsyncIterator[List[Any]]:
+        """Map the elements and yield completed chunks in input order"""
+        workflow_id = self.get_parameter("workflow", "")
+        chunk_size = max(1, int(self.get_parameter("chunk_size", 1)))
+        concurrency = max(1, int(self.get_parameter("concurrency", 4)))
+
+        if not workflow_id:
+            chunk = []
+            async for element in self._iter_elements(input_data):
+                chunk.append(element)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+            return
+
+        if self.subworkflow_runner is None:
+            raise ValueError("Map node requires an engine to run sub-workflows")
+
+        semaphore = asyncio.Semaphore(concurrency)
+        pending: List[asyncio.Task] = []
+
+        async def run(index: int, element: Any) -> Any:
+            try:
+                return await self._run_element(workflow_id, index, element)
+            finally:
+                semaphore.release()
+
+        try:
+            index = 0
+            async for element in self._iter_elements(input_data):
+                # Acquire before creating the task so at most `concurrency` run at once
+                await semaphore.acquire()
+                pending.append(asyncio.create_task(run(index, element)))
+                index += 1
+                while len(pending) >= chunk_size and all(task.done() for task in pending[:chunk_size]):
+                    yield [task.result() for task in pending[:chunk_size]]
+                    del pending[:chunk_size]
+            while pending:
+                chunk = pending[:chunk_size]
+                yield list(await asyncio.gather(*chunk))
+                del pending[:chunk_size]
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _stream(self, input_data: Any) -> AsyncIterator[Any]:
+        """Yield one record per result, or one list per chunk without a sub-workflow"""
+        mapping = bool(self.get_parameter("workflow", ""))
+        async for chunk in self._iter_chunks(input_data):
+            if mapping:
+                for result in chunk:
+                    yield result
+            else:
+                yield chunk
+
+    async def execute(self, input_data: Any) -> Any:
+        """Execute map over the input list"""
+        if self.get_parameter("stream", False):
+            return self._stream(input_data)
+
+        results = []
+        async for record in self._stream(input_data):
+            results.append(record)
+        errors = sum(1 for r in results if isinstance(r, dict) and "error" in r and "index" in r)
+        return {
+            "results": results,
+            "count": len(results),
+            "errors": errors
+        }
@@ -3,16 +3,30 @@
 Transform Node - Transform and manipulate data
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List
 import json
 
+from workflow_engine.expressions import compile_format, render_for
 from workflow_engine.nodes.base_node import BaseNode
 
 class TransformNode(BaseNode):
     """Node for data transformation"""
     
+    # format_string templates have their own syntax ({field}, {{ and }} escapes)
+    raw_parameters = ("template",)
+    
+    def __init__(self, node_config: Dict, config_manager=None):
+        super().__init__(node_config, config_manager)
+        # A malformed format_string expression fails the workflow load
+        if self.parameters.get("operation") == "format_string":
+            self._format_template()
+    
     async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute data transformation"""
+        return self.run_sync(input_data)
+    
+    def run_sync(self, input_data: Any) -> Any:
+        """Transform synchronously (also used when offloaded to a worker)"""
         operation = self.get_parameter("operation", "pass_through")
         
         if operation == "pass_through":
@@ -54,10 +68,54 @@ class TransformNode(BaseNode):
             return None
         
         elif operation == "format_string":
-            template = self.get_parameter("template", "{data}")
-            if isinstance(input_data, dict):
-                return template.format(**input_data)
-            return template.format(data=input_data)
+            # {field} and {{$json.path}} placeholders, compiled once per template
+            return render_for(self._format_template(), input_data)
         
         else:
             return input_data
+    
+    async def execute_batch(self, items: List[Any]) -> List[Any]:
+        """Transform a whole list of records in one pass"""
+        if self.has_templates():
+            # $json must be each record in turn
+            return await super().execute_batch(items)
+        
+        operation = self.get_parameter("operation", "pass_through")
+        
+        if operation == "pass_through":
+            return items
+        
+        elif operation == "map":
+            map_key = self.get_parameter("map_key", "")
+            return [item.get(map_key) if isinstance(item, dict) else None for item in items]
+        
+        elif operation == "filter":
+            # Drop non-matching records instead of emitting empty ones
+            filter_key = self.get_parameter("filter_key", "")
+            filter_value = self.get_parameter("filter_value", "")
+            return [
+                item for item in items
+                if not isinstance(item, dict)
+                or (filter_key in item and item[filter_key] == filter_value)
+            ]
+        
+        elif operation == "merge":
+            merge_data = self.get_parameter("merge_data", {})
+            return [{**item, **merge_data} if isinstance(item, dict) else merge_data for item in items]
+        
+        elif operation == "format_string":
+            template = self._format_template()
+            return [render_for(template, item) for item in items]
+        
+        return await super().execute_batch(items)
+    
+    def node_references(self) -> set:
+        """Ids of the nodes the parameters (or the format_string template) refer to"""
+        references = super().node_references()
+        if self.parameters.get("operation") == "format_string":
+            references |= self._format_template().node_references()
+        return references
+    
+    def _format_template(self):
+        """Compiled format_string template (rendered per record, not per node input)"""
+        return compile_format(str(self.parameters.get("template", "{data}")))
@@ -3,15 +3,25 @@
 Voiceover Node - Generate voiceovers using text-to-speech
 """
 
-import aiohttp
+import hashlib
+import os
 from typing import Dict, Any
 import json
 
+from workflow_engine.coalescing import SingleFlight
+from workflow_engine.file_io import AtomicFileWriter, run_blocking
 from workflow_engine.nodes.base_node import BaseNode
 
+CHUNK_SIZE = 64 * 1024
+
 class VoiceoverNode(BaseNode):
     """Node for text-to-speech/voiceover generation"""
     
+    def __init__(self, node_config: Dict, config_manager=None):
+        super().__init__(node_config, config_manager)
+        # Concurrent requests for the same clip share one synthesis
+        self._syntheses = SingleFlight()
+    
     async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute voiceover generation"""
         provider = self.get_parameter("provider", "elevenlabs")
@@ -44,9 +54,47 @@ class VoiceoverNode(BaseNode):
                 "audio_file": "voiceover.mp3"
             }
         
+        if provider == "elevenlabs":
+            voice = voice_id
+        elif provider == "openai":
+            voice = self.get_parameter("voice", "alloy")
+            model = "tts-1"
+        else:
+            return {"error": "Voiceover generation failed"}
+        
+        # Identical requests produce the same audio; reuse it instead of paying again
+        audio_file = self._audio_file_name(provider, voice, model, text)
+        file_path = os.path.join(self.get_parameter("output_dir", "workflows/audio"), audio_file)
+        size = await run_blocking(_file_size, file_path)
+        cached = size is not None
+        if not cached:
+            size = await self._syntheses.do(
+                file_path, lambda: self._synthesize(provider, api_key, voice, model, text, file_path)
+            )
+        
+        return {
+            "voiceover_url": file_path,
+            "audio_file": audio_file,
+            "text": text,
+            "provider": provider,
+            "size_bytes": size,
+            "cached": cached
+        }
+    
+    @staticmethod
+    def _audio_file_name(provider: str, voice: str, model: str, text: str) -> str:
+        """Stable, content-addressed file name for a synthesized clip"""
+        canonical = json.dumps([provider, voice, model, text], separators=(",", ":"))
+        return f"voiceover_{hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]}.mp3"
+    
+    async def _synthesize(self, provider: str, api_key: str, voice: str, model: str, text: str, file_path: str) -> int:
+        """Call the TTS API and stream the audio to file_path, returning its size"""
+        # "base_url" points at a compatible proxy or stand-in
+        base_url = self.get_parameter("base_url")
+        
         # Use ElevenLabs API
         if provider == "elevenlabs":
-            url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
+            url = f"{base_url or 'https://api.elevenlabs.io/v1'}/text-to-speech/{voice}"
             headers = {
                 "Accept": "audio/mpeg",
                 "Content-Type": "application/json",
@@ -60,67 +108,37 @@ class VoiceoverNode(BaseNode):
                     "similarity_boost": 0.5
                 }
             }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, json=payload) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        raise Exception(f"ElevenLabs API error: {response.status} - {error_text}")
-                    
-                    # Save audio to file
-                    audio_data = await response.read()
-                    audio_file = f"voiceover_{hash(text) % 10000}.mp3"
-                    
-                    import os
-                    os.makedirs("workflows/audio", exist_ok=True)
-                    file_path = f"workflows/audio/{audio_file}"
-                    
-                    with open(file_path, 'wb') as f:
-                        f.write(audio_data)
-                    
-                    return {
-                        "voiceover_url": file_path,
-                        "audio_file": audio_file,
-                        "text": text,
-                        "provider": "elevenlabs",
-                        "size_bytes": len(audio_data)
-                    }
+            error_label = "ElevenLabs API error"
         
         # Use OpenAI TTS
-        elif provider == "openai":
-            url = "https://api.openai.com/v1/audio/speech"
+        else:
+            url = f"{base_url or 'https://api.openai.com/v1'}/audio/speech"
             headers = {
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json"
             }
             payload = {
-                "model": "tts-1",
+                "model": model,
                 "input": text,
-                "voice": self.get_parameter("voice", "alloy")
+                "voice": voice
             }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, json=payload) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        raise Exception(f"OpenAI TTS error: {response.status} - {error_text}")
-                    
-                    audio_data = await response.read()
-                    audio_file = f"voiceover_{hash(text) % 10000}.mp3"
-                    
-                    import os
-                    os.makedirs("workflows/audio", exist_ok=True)
-                    file_path = f"workflows/audio/{audio_file}"
-                    
-                    with open(file_path, 'wb') as f:
-                        f.write(audio_data)
-                    
-                    return {
-                        "voiceover_url": file_path,
-                        "audio_file": audio_file,
-                        "text": text,
-                        "provider": "openai",
-                        "size_bytes": len(audio_data)
-                    }
+            error_label = "OpenAI TTS error"
         
-        return {"error": "Voiceover generation failed"}
+        async with self.http_request("POST", url, credential=api_key, headers=headers, json=payload) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                raise Exception(f"{error_label}: {response.status} - {error_text}")
+            
+            # Stream the audio to disk instead of buffering the whole clip
+            async with AtomicFileWriter(file_path) as writer:
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    await writer.write(chunk)
+            return writer.size
+
+def _file_size(path: str):
+    """Size of an existing non-empty file, or None"""
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return None
+    return size or None
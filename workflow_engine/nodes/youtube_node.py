@@ -4,11 +4,27 @@ YouTube Node - Extract video data and check viral criteria
 """
 
 import re
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Optional
 from datetime import datetime, timedelta
 
 from workflow_engine.nodes.base_node import BaseNode
 
+# watch?v=, youtu.be/, embed/, shorts/, live/ and v/ URLs (any subdomain)
+VIDEO_ID_RE = re.compile(
+    r'(?:youtube\.com/(?:watch\?(?:[^#\s]*?&)?v=|embed/|shorts/|live/|v/)|youtu\.be/)([a-zA-Z0-9_-]{11})'
+)
+# A bare video ID on its own (bulk lists)
+BARE_ID_RE = re.compile(r'[a-zA-Z0-9_-]{11}')
+
+def extract_video_id(url: str) -> Optional[str]:
+    """Get the video ID of a YouTube URL, or None"""
+    match = VIDEO_ID_RE.search(url)
+    return match.group(1) if match else None
+
+def video_url(video_id: str) -> str:
+    """Canonical watch URL of a video"""
+    return f"https://www.youtube.com/watch?v={video_id}"
+
 class YouTubeNode(BaseNode):
     """Node for YouTube operations"""
     
@@ -18,64 +34,133 @@ class YouTubeNode(BaseNode):
         
         if operation == "extract_id":
             # Extract YouTube video ID from URL
-            url = input_data.get("url", "") or str(input_data)
-            
-            # Pattern to match YouTube URLs
-            patterns = [
-                r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})',
-                r'youtube\.com\/watch\?.*v=([a-zA-Z0-9_-]{11})'
-            ]
-            
-            video_id = None
-            for pattern in patterns:
-                match = re.search(pattern, url)
-                if match:
-                    video_id = match.group(1)
-                    break
-            
-            return {
-                "video_id": video_id,
-                "url": url,
-                "video_url": f"https://www.youtube.com/watch?v={video_id}" if video_id else None
-            }
+            return self._extract_id(input_data)
+        
+        elif operation == "extract_ids":
+            # Extract, normalize and dedupe the IDs of a whole list of URLs
+            return self._extract_ids(self._url_list(input_data))
         
         elif operation == "check_viral":
-            # Check if video meets viral criteria
-            views = int(input_data.get("views", 0) or 0)
-            published_at = input_data.get("published_at", "")
-            min_views_1day = self.get_parameter("min_views_1day", 10000)
-            min_views_7day = self.get_parameter("min_views_7day", 50000)
-            min_views_30day = self.get_parameter("min_views_30day", 200000)
-            
-            # Parse published date
-            try:
-                if isinstance(published_at, str):
-                    # Try ISO format
-                    pub_date = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-                else:
-                    pub_date = datetime.now()
-            except:
-                pub_date = datetime.now()
-            
-            # Calculate days since publication
-            days_ago = (datetime.now() - pub_date.replace(tzinfo=None)).days
-            
-            # Check viral criteria
-            is_viral = False
-            if days_ago <= 1 and views >= min_views_1day:
-                is_viral = True
-            elif days_ago <= 7 and views >= min_views_7day:
-                is_viral = True
-            elif days_ago <= 30 and views >= min_views_30day:
-                is_viral = True
-            
-            return {
-                "is_viral": is_viral,
-                "views": views,
-                "days_ago": days_ago,
-                "criteria_met": is_viral,
-                **input_data
-            }
+            # Check if video meets viral criteria (a list is checked in one pass)
+            if isinstance(input_data, list):
+                return await self.execute_batch(input_data)
+            return self._check_viral(input_data, datetime.now(), self._viral_thresholds())
         
         else:
             return input_data
+    
+    async def execute_batch(self, items: List[Any]) -> List[Any]:
+        """Execute YouTube operation over a list of records"""
+        if self.has_templates():
+            # Templated parameters render against each record in turn
+            return await super().execute_batch(items)
+        operation = self.get_parameter("operation", "extract_id")
+        
+        if operation == "check_viral":
+            # Evaluate every record against one clock reading and threshold set
+            now = datetime.now()
+            thresholds = self._viral_thresholds()
+            return [self._check_viral(item, now, thresholds) for item in items]
+        
+        elif operation == "extract_id":
+            return [self._extract_id(item) for item in items]
+        
+        return await super().execute_batch(items)
+    
+    def _extract_id(self, input_data: Any) -> Dict[str, Any]:
+        """Extract the video ID of one record's url"""
+        url = (input_data.get("url", "") if isinstance(input_data, dict) else "") or str(input_data)
+        video_id = extract_video_id(url)
+        return {
+            "video_id": video_id,
+            "url": url,
+            "video_url": video_url(video_id) if video_id else None
+        }
+    
+    def _url_list(self, input_data: Any) -> Iterable[Any]:
+        """URLs given by the "urls" parameter or the input: a list, or newline-delimited text"""
+        urls = self.get_parameter("urls")
+        if urls is None:
+            if isinstance(input_data, dict):
+                urls = input_data.get("urls", input_data.get("text", input_data.get("url", "")))
+            else:
+                urls = input_data
+        if isinstance(urls, str):
+            return urls.splitlines()
+        return urls or []
+    
+    def _extract_ids(self, urls: Iterable[Any]) -> Dict[str, Any]:
+        """Video IDs of many URLs (or bare IDs), deduplicated, in first-seen order"""
+        search = VIDEO_ID_RE.search
+        bare = BARE_ID_RE.fullmatch
+        seen = set()
+        videos = []
+        duplicates = 0
+        invalid = 0
+        for url in urls:
+            if isinstance(url, dict):
+                url = url.get("url", "")
+            url = str(url).strip()
+            if not url:
+                continue
+            match = search(url) or bare(url)
+            if match is None:
+                invalid += 1
+                continue
+            video_id = match.group(match.lastindex or 0)
+            if video_id in seen:
+                duplicates += 1
+                continue
+            seen.add(video_id)
+            videos.append({"video_id": video_id, "url": url, "video_url": video_url(video_id)})
+        
+        return {
+            "videos": videos,
+            "count": len(videos),
+            "duplicates": duplicates,
+            "invalid": invalid
+        }
+    
+    def _viral_thresholds(self):
+        """Minimum views for videos up to 1, 7 and 30 days old"""
+        return (
+            self.get_parameter("min_views_1day", 10000),
+            self.get_parameter("min_views_7day", 50000),
+            self.get_parameter("min_views_30day", 200000),
+        )
+    
+    def _check_viral(self, input_data: Dict[str, Any], now: datetime, thresholds) -> Dict[str, Any]:
+        """Check one video record against the viral criteria"""
+        min_views_1day, min_views_7day, min_views_30day = thresholds
+        views = int(input_data.get("views", 0) or 0)
+        published_at = input_data.get("published_at", "")
+        
+        # Parse published date
+        try:
+            if isinstance(published_at, str):
+                # Try ISO format
+                pub_date = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
+            else:
+                pub_date = now
+        except:
+            pub_date = now
+        
+        # Calculate days since publication
+        days_ago = (now - pub_date.replace(tzinfo=None)).days
+        
+        # Check viral criteria
+        is_viral = False
+        if days_ago <= 1 and views >= min_views_1day:
+            is_viral = True
+        elif days_ago <= 7 and views >= min_views_7day:
+            is_viral = True
+        elif days_ago <= 30 and views >= min_views_30day:
+            is_viral = True
+        
+        return {
+            "is_viral": is_viral,
+            "views": views,
+            "days_ago": days_ago,
+            "criteria_met": is_viral,
+            **input_data
+        }
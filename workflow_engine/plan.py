@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Execution Plan - Compiled, immutable form of a workflow definition
+"""
+
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Tuple, Mapping
+
+class ExecutionPlan:
+    """Workflow graph compiled once at load time and shared by every execution"""
+
+    __slots__ = (
+        "workflow_def", "nodes", "order", "entry_nodes", "successors",
+        "predecessors", "in_degree", "levels", "cycles", "unreachable", "branches",
+    )
+
+    def __init__(
+        self,
+        workflow_def: Dict,
+        nodes: Mapping[str, Dict],
+        order: Tuple[str, ...],
+        entry_nodes: Tuple[str, ...],
+        successors: Mapping[str, Tuple[str, ...]],
+        predecessors: Mapping[str, Tuple[str, ...]],
+        in_degree: Mapping[str, int],
+        levels: Tuple[Tuple[str, ...], ...],
+        cycles: Tuple[Tuple[str, ...], ...],
+        unreachable: Tuple[str, ...],
+        branches: Mapping[Tuple[str, str], str] = None,
+    ):
+        object.__setattr__(self, "workflow_def", workflow_def)
+        object.__setattr__(self, "nodes", MappingProxyType(dict(nodes)))
+        object.__setattr__(self, "order", order)
+        object.__setattr__(self, "entry_nodes", entry_nodes)
+        object.__setattr__(self, "successors", MappingProxyType(dict(successors)))
+        object.__setattr__(self, "predecessors", MappingProxyType(dict(predecessors)))
+        object.__setattr__(self, "in_degree", MappingProxyType(dict(in_degree)))
+        object.__setattr__(self, "levels", levels)
+        object.__setattr__(self, "cycles", cycles)
+        object.__setattr__(self, "unreachable", unreachable)
+        object.__setattr__(self, "branches", MappingProxyType(dict(branches or {})))
+
+    def __setattr__(self, key, value):
+        raise AttributeError("ExecutionPlan is immutable")
+
+    def __delattr__(self, key):
+        raise AttributeError("ExecutionPlan is immutable")
+
+    def get_node(self, node_id: str) -> Dict:
+        """Get a node definition by id"""
+        return self.nodes[node_id]
+
+    def get_successors(self, node_id: str) -> Tuple[str, ...]:
+        """Get the ids of nodes fed by a node"""
+        return self.successors.get(node_id, ())
+
+    def get_predecessors(self, node_id: str) -> Tuple[str, ...]:
+        """Get the ids of nodes feeding a node"""
+        return self.predecessors.get(node_id, ())
+
+    def get_branch(self, source_id: str, target_id: str) -> Optional[str]:
+        """Get the branch label of a connection, or None when it is unconditional"""
+        return self.branches.get((source_id, target_id))
+
+    def describe_cycles(self) -> str:
+        """Human readable description of detected cycles"""
+        return ", ".join(" -> ".join(cycle + (cycle[0],)) for cycle in self.cycles)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __repr__(self) -> str:
+        return (
+            f"ExecutionPlan(nodes={len(self.order)}, entries={list(self.entry_nodes)}, "
+            f"levels={len(self.levels)}, unreachable={len(self.unreachable)})"
+        )
+
+def compile_workflow(workflow_def: Dict) -> ExecutionPlan:
+    """Compile a workflow definition into an ExecutionPlan
+
+    Raises ValueError for missing or duplicate node ids and for connections
+    that reference unknown nodes. Cycles and nodes unreachable from the entry
+    points are recorded on the plan for the caller to act on.
+    """
+    node_list = workflow_def.get("nodes", [])
+    connections = workflow_def.get("connections", {}) or {}
+
+    # id -> node index
+    nodes: Dict[str, Dict] = {}
+    order: List[str] = []
+    for node in node_list:
+        node_id = node.get("id")
+        if not node_id:
+            raise ValueError(f"Node of type '{node.get('type', 'unknown')}' missing 'id'")
+        if node_id in nodes:
+            raise ValueError(f"Duplicate node id: {node_id}")
+        nodes[node_id] = node
+        order.append(node_id)
+
+    # Adjacency lists, deduplicated while keeping declaration order.
+    # Targets are a list, or lists keyed by branch label ({"true": [...],
+    # "false": [...]}) for nodes that route their output.
+    successors: Dict[str, List[str]] = {node_id: [] for node_id in order}
+    predecessors: Dict[str, List[str]] = {node_id: [] for node_id in order}
+    branches: Dict[Tuple[str, str], Optional[str]] = {}
+    for source_id, targets in connections.items():
+        if source_id not in nodes:
+            raise ValueError(f"Connection from unknown node: {source_id}")
+        if isinstance(targets, dict):
+            labeled = [
+                (str(label), target_id)
+                for label, branch_targets in targets.items()
+                for target_id in ([branch_targets] if isinstance(branch_targets, str) else branch_targets)
+            ]
+        else:
+            labeled = [(None, target_id) for target_id in ([targets] if isinstance(targets, str) else targets)]
+        for label, target_id in labeled:
+            if target_id not in nodes:
+                raise ValueError(f"Connection from '{source_id}' to unknown node: {target_id}")
+            edge = (source_id, target_id)
+            if edge in branches:
+                # Reached from several branches: no longer conditional
+                if branches[edge] != label:
+                    branches[edge] = None
+                continue
+            branches[edge] = label
+            successors[source_id].append(target_id)
+            predecessors[target_id].append(source_id)
+
+    in_degree = {node_id: len(predecessors[node_id]) for node_id in order}
+
+    cycles = _find_cycles(order, successors)
+    levels = _topological_levels(order, successors, in_degree)
+
+    # Entry points: trigger nodes, or the first node when there are none
+    entry_nodes = tuple(node_id for node_id in order if nodes[node_id].get("type") == "trigger")
+    if not entry_nodes and order:
+        entry_nodes = (order[0],)
+
+    reachable = set(entry_nodes)
+    stack = list(entry_nodes)
+    while stack:
+        for target_id in successors[stack.pop()]:
+            if target_id not in reachable:
+                reachable.add(target_id)
+                stack.append(target_id)
+    unreachable = tuple(node_id for node_id in order if node_id not in reachable)
+
+    return ExecutionPlan(
+        workflow_def=workflow_def,
+        nodes=nodes,
+        order=tuple(order),
+        entry_nodes=entry_nodes,
+        successors={k: tuple(v) for k, v in successors.items()},
+        predecessors={k: tuple(v) for k, v in predecessors.items()},
+        in_degree=in_degree,
+        levels=levels,
+        cycles=cycles,
+        unreachable=unreachable,
+        branches={edge: label for edge, label in branches.items() if label is not None},
+    )
+
+def _topological_levels(
+    order: List[str],
+    successors: Dict[str, List[str]],
+    in_degree: Dict[str, int],
+) -> Tuple[Tuple[str, ...], ...]:
+    """Group nodes into levels where every node only depends on earlier levels (Kahn)"""
+    remaining = dict(in_degree)
+    current = [node_id for node_id in order if remaining[node_id] == 0]
+    levels = []
+    while current:
+        levels.append(tuple(current))
+        following = []
+        for node_id in current:
+            for target_id in successors[node_id]:
+                remaining[target_id] -= 1
+                if remaining[target_id] == 0:
+                    following.append(target_id)
+        current = following
+    return tuple(levels)
+
+def _find_cycles(order: List[str], successors: Dict[str, List[str]]) -> Tuple[Tuple[str, ...], ...]:
+    """Find one representative cycle per back edge with an iterative DFS"""
+    WHITE, GREY, BLACK = 0, 1, 2
+    color = {node_id: WHITE for node_id in order}
+    cycles: List[Tuple[str, ...]] = []
+
+    for root in order:
+        if color[root] != WHITE:
+            continue
+        path: List[str] = [root]
+        iterators: List[Any] = [iter(successors[root])]
+        color[root] = GREY
+        while iterators:
+            target_id = next(iterators[-1], None)
+            if target_id is None:
+                color[path.pop()] = BLACK
+                iterators.pop()
+            elif color[target_id] == WHITE:
+                color[target_id] = GREY
+                path.append(target_id)
+                iterators.append(iter(successors[target_id]))
+            elif color[target_id] == GREY:
+                cycles.append(tuple(path[path.index(target_id):]))
+
+    return tuple(cycles)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Rate Limit - Client-side token buckets per provider host and API key
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Token bucket that spaces requests out to a steady rate
+
+    Each acquire() takes a token, waiting until one has accrued. Waiters
+    reserve their token up front (the balance may go negative), so
+    concurrent callers are released one interval apart instead of all
+    retrying at once.
+    """
+
+    def __init__(self, rate: float, burst: float = 1):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.requests = 0
+        self.waits = 0
+        self.wait_time = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Take one token, sleeping until it is available"""
+        self._refill()
+        self.tokens -= 1
+        self.requests += 1
+        if self.tokens >= 0:
+            return
+        delay = -self.tokens / self.rate
+        self.waits += 1
+        self.wait_time += delay
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            # Hand the reserved token back to the callers queued behind us
+            self.tokens += 1
+            raise
+
+    def pause(self, seconds: float):
+        """Hold every caller back for seconds (the upstream sent Retry-After)"""
+        self._refill()
+        self.tokens = min(self.tokens, 1 - (seconds * self.rate))
+
+class RateLimiters:
+    """Token buckets keyed by (host, API key), configured per host
+
+    ```
+    "rate_limits": {
+        "openrouter.ai": {"requests_per_minute": 60, "burst": 5},
+        "api.elevenlabs.io": {"requests_per_second": 2}
+    }
+    ```
+
+    Hosts without an entry are not limited. Every credential gets its own
+    bucket, since providers count requests per key.
+    """
+
+    def __init__(self, rate_config: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.limits: Dict[str, Tuple[float, float]] = {}
+        for host, limit in (rate_config or {}).items():
+            if not isinstance(limit, dict):
+                continue
+            if "requests_per_second" in limit:
+                rate = float(limit["requests_per_second"])
+            elif "requests_per_minute" in limit:
+                rate = float(limit["requests_per_minute"]) / 60
+            else:
+                logger.warning(f"Rate limit for {host} has no requests_per_second/requests_per_minute; ignored")
+                continue
+            if rate > 0:
+                self.limits[host] = (rate, float(limit.get("burst", 1)))
+        self._buckets: Dict[Tuple[str, Optional[str]], TokenBucket] = {}
+
+    def get(self, host: str, credential: Optional[str] = None) -> Optional[TokenBucket]:
+        """Get the bucket for a host and credential, or None when the host is unlimited"""
+        limit = self.limits.get(host)
+        if limit is None:
+            limit = self.limits.get(host.rsplit(":", 1)[0])
+            if limit is None:
+                return None
+        # Only a digest of the credential is kept in memory
+        key_id = hashlib.sha256(credential.encode("utf-8")).hexdigest()[:16] if credential else None
+        bucket = self._buckets.get((host, key_id))
+        if bucket is None:
+            bucket = TokenBucket(*limit)
+            self._buckets[(host, key_id)] = bucket
+        return bucket
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Requests and time spent waiting per host and key"""
+        return {
+            f"{host}#{key_id or '-'}": {
+                "requests": bucket.requests,
+                "waits": bucket.waits,
+                "wait_time": round(bucket.wait_time, 3)
+            }
+            for (host, key_id), bucket in self._buckets.items()
+        }
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Resilience - Retry/timeout policies for nodes and per-host circuit breakers
+"""
+
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Awaitable, Callable, List, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETRY_ON = [429, 500, 502, 503, 504]
+
+class HTTPStatusError(Exception):
+    """An upstream answered with a status the node's retry policy treats as transient"""
+
+    def __init__(self, status: int, host: str, message: str = "", retry_after: Optional[float] = None):
+        super().__init__(message or f"HTTP {status} from {host}")
+        self.status = status
+        self.host = host
+        self.retry_after = retry_after
+
+class CircuitOpenError(Exception):
+    """Requests to a host are short-circuited after repeated failures"""
+
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f"Circuit open for {host}; retry in {retry_after:.1f}s")
+        self.host = host
+        self.retry_after = retry_after
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delay-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+class RetryPolicy:
+    """Timeout and retry settings declared on a node definition
+
+    ```
+    "timeout": 60,
+    "retry": {"max_retries": 3, "backoff": 1.0, "max_backoff": 30,
+              "jitter": 0.5, "retry_on": [429, 500, 502, 503, 504]}
+    ```
+    """
+
+    __slots__ = ("timeout", "max_retries", "backoff", "max_backoff", "jitter", "retry_on", "max_retry_after")
+
+    def __init__(self, timeout: Optional[float] = None, retry: Optional[Dict[str, Any]] = None):
+        retry = retry or {}
+        self.timeout = timeout
+        self.max_retries = retry.get("max_retries", 3 if retry else 0)
+        self.backoff = retry.get("backoff", 1.0)
+        self.max_backoff = retry.get("max_backoff", 30.0)
+        self.jitter = retry.get("jitter", 0.5)
+        self.retry_on: List[int] = list(retry.get("retry_on", DEFAULT_RETRY_ON))
+        self.max_retry_after = retry.get("max_retry_after", 60.0)
+
+    @classmethod
+    def from_node(cls, node: Dict) -> Optional["RetryPolicy"]:
+        """Build the policy of a node definition, or None when it declares none"""
+        if node.get("timeout") is None and not node.get("retry"):
+            return None
+        retry = node.get("retry")
+        return cls(node.get("timeout"), retry if isinstance(retry, dict) else ({"max_retries": 3} if retry else None))
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """Whether a failed attempt is worth repeating"""
+        if isinstance(error, HTTPStatusError):
+            return error.status in self.retry_on
+        return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError))
+
+    def delay(self, attempt: int, error: BaseException) -> float:
+        """Backoff before the next attempt: exponential with jitter, at least Retry-After"""
+        delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+        delay *= 1 - self.jitter * random.random()
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_retry_after))
+        return delay
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[Any]],
+        label: str = "node",
+        retry: bool = True,
+        on_retry: Optional[Callable[[int], None]] = None
+    ) -> Any:
+        """Run call() under the timeout, retrying transient failures
+
+        on_retry(attempt) is called before each retry.
+        """
+        max_retries = self.max_retries if retry else 0
+        attempt = 0
+        while True:
+            try:
+                if self.timeout is not None:
+                    return await asyncio.wait_for(call(), self.timeout)
+                return await call()
+            except Exception as e:
+                if attempt >= max_retries or not self.is_retryable(e):
+                    if isinstance(e, asyncio.TimeoutError):
+                        raise asyncio.TimeoutError(f"{label} timed out after {self.timeout}s") from e
+                    raise
+                delay = self.delay(attempt, e)
+                attempt += 1
+                logger.warning(
+                    f"{label} failed ({str(e) or type(e).__name__}); retry {attempt}/{max_retries} in {delay:.2f}s"
+                )
+                if on_retry is not None:
+                    on_retry(attempt)
+                await asyncio.sleep(delay)
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one host
+
+    After failure_threshold consecutive failures the circuit opens and
+    requests fail immediately for reset_timeout seconds; then a single
+    trial request is let through (half-open) and its outcome closes or
+    reopens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, host: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def before_request(self):
+        """Raise CircuitOpenError unless a request may be sent now"""
+        if self.state == self.CLOSED:
+            return
+        remaining = self.opened_at + self.reset_timeout - time.monotonic()
+        if self.state == self.OPEN and remaining <= 0:
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return
+        raise CircuitOpenError(self.host, max(remaining, 0.0))
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_abandoned(self):
+        """A request ended without an outcome (cancelled); free the trial slot"""
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Circuit opened for {self.host} after {self.failures} failures")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+class CircuitBreakers:
+    """Per-host circuit breakers shared by every node of an engine"""
+
+    def __init__(self, breaker_config: Optional[Dict] = None):
+        breaker_config = breaker_config or {}
+        self.enabled = breaker_config.get("enabled", True)
+        self.failure_threshold = breaker_config.get("failure_threshold", 5)
+        self.reset_timeout = breaker_config.get("reset_timeout", 30.0)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, host: str) -> Optional[CircuitBreaker]:
+        """Get the breaker of a host, or None when breakers are disabled"""
+        if not self.enabled:
+            return None
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(host, self.failure_threshold, self.reset_timeout)
+            self._breakers[host] = breaker
+        return breaker
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """State and consecutive failures per host"""
+        return {
+            host: {"state": breaker.state, "failures": breaker.failures}
+            for host, breaker in self._breakers.items()
+        }
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Response Cache - Content-addressed memoization of AI/API responses
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache:
+    """Two-tier response cache: in-memory LRU in front of an SQLite file
+
+    Keys are SHA-256 digests of the canonical JSON of everything that
+    determines a response (provider, model, messages, sampling settings),
+    so identical requests map to the same entry across processes.
+    """
+
+    def __init__(self, cache_config: Optional[Dict] = None):
+        cache_config = cache_config or {}
+        self.path = cache_config.get("path", "./workflows/cache/responses.sqlite3")
+        self.disk_enabled = cache_config.get("disk", True)
+        self.max_memory_entries = cache_config.get("max_memory_entries", 1000)
+        self.default_ttl = cache_config.get("default_ttl", 86400)
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(namespace: str, **parts: Any) -> str:
+        """Build a cache key from the request parts that determine the response"""
+        canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+        return f"{namespace}:{hashlib.sha256(canonical.encode('utf-8')).hexdigest()}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a cached response, or None when missing or expired"""
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > now:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return copy.deepcopy(value)
+            del self._memory[key]
+
+        if self.disk_enabled:
+            loop = asyncio.get_running_loop()
+            entry = await loop.run_in_executor(None, self._disk_get, key, now)
+            if entry is not None:
+                self._remember(key, *entry)
+                self.disk_hits += 1
+                return copy.deepcopy(entry[1])
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a response for ttl seconds (default_ttl when not given)"""
+        expires_at = time.time() + (self.default_ttl if ttl is None else ttl)
+        value = copy.deepcopy(value)
+        self._remember(key, expires_at, value)
+        if self.disk_enabled:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._disk_set, key, expires_at, value)
+
+    def _remember(self, key: str, expires_at: float, value: Any):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            try:
+                row = self._connect().execute(
+                    "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if row[1] <= now:
+                    self._connect().execute("DELETE FROM responses WHERE key = ?", (key,))
+                    return None
+                return row[1], json.loads(row[0])
+            except sqlite3.Error as e:
+                logger.warning(f"Response cache read failed: {e}")
+                return None
+
+    def _disk_set(self, key: str, expires_at: float, value: Any):
+        with self._lock:
+            try:
+                self._connect().execute(
+                    "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), expires_at),
+                )
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.warning(f"Response cache write failed: {e}")
+
+    def purge_expired(self) -> int:
+        """Delete expired entries from both tiers, returning how many disk rows were removed"""
+        now = time.time()
+        for key in [k for k, (expires_at, _) in self._memory.items() if expires_at <= now]:
+            del self._memory[key]
+        if not self.disk_enabled:
+            return 0
+        with self._lock:
+            cursor = self._connect().execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+            return cursor.rowcount
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+    def close(self):
+        """Close the on-disk tier"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
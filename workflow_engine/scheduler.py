@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+DAG Scheduler - Dependency-aware concurrent execution of an ExecutionPlan
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack
+from typing import Dict, Any, Callable, Awaitable, Optional
+
+from workflow_engine import expressions
+from workflow_engine.plan import ExecutionPlan
+from workflow_engine.streams import RecordStream
+
+logger = logging.getLogger(__name__)
+
+# run_node(node, input_data, queue_wait_seconds)
+NodeRunner = Callable[[Dict, Any, float], Awaitable[Dict]]
+
+class DAGScheduler:
+    """Runs every node as soon as all of its predecessors have settled
+
+    A node with several parents waits for all of them and receives their
+    merged outputs. Parents that failed (or were never run) contribute
+    nothing; a node whose parents all failed is skipped, which matches the
+    engine's rule that a failed node stops its branch. Likewise a parent
+    whose result names a "branch" only feeds connections with that label
+    (or none), so the untaken side of a condition is skipped entirely.
+    """
+
+    def __init__(
+        self,
+        plan: ExecutionPlan,
+        run_node: NodeRunner,
+        max_concurrency: Optional[int] = None,
+        global_semaphore: Optional[asyncio.Semaphore] = None,
+    ):
+        self.plan = plan
+        self.run_node = run_node
+        self.semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self.global_semaphore = global_semaphore
+
+    async def run(self, initial_data: Any, completed: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
+        """Execute the plan and return the result envelope of every executed node
+
+        Nodes with a result in `completed` (checkpoints of an interrupted
+        run) are not executed again; their recorded result is used instead.
+        """
+        plan = self.plan
+        completed = completed or {}
+        unreachable = set(plan.unreachable)
+        pending = {
+            node_id: sum(1 for pred in plan.get_predecessors(node_id) if pred not in unreachable)
+            for node_id in plan.order
+            if node_id not in unreachable
+        }
+        inputs: Dict[str, Dict[str, Any]] = {}
+        started = set()
+        node_data: Dict[str, Dict] = {}
+        results: asyncio.Queue = asyncio.Queue()
+        tasks: Dict[str, asyncio.Task] = {}
+        # Node tasks see the results gathered so far ($node references)
+        outputs_token = expressions.bind_outputs(node_data)
+
+        def launch(node_id: str, input_data: Any):
+            started.add(node_id)
+            if node_id in completed:
+                tasks[node_id] = asyncio.create_task(self._replay(node_id, completed[node_id], results))
+            else:
+                tasks[node_id] = asyncio.create_task(self._run_one(node_id, input_data, results))
+
+        def settle(node_id: str, result: Optional[Dict]):
+            stack = [(node_id, result)]
+            while stack:
+                source_id, source_result = stack.pop()
+                delivered = source_result is not None and source_result.get("success")
+                # Routing nodes (conditions) only feed connections of the taken branch
+                branch = source_result.get("branch") if delivered else None
+                for target_id in plan.get_successors(source_id):
+                    if target_id in started:
+                        continue
+                    label = plan.get_branch(source_id, target_id)
+                    if delivered and (branch is None or label is None or label == branch):
+                        data = source_result.get("data", {})
+                        if isinstance(data, RecordStream):
+                            data.reserve()
+                        inputs.setdefault(target_id, {})[source_id] = data
+                    pending[target_id] -= 1
+                    if pending[target_id] > 0:
+                        continue
+                    if target_id in inputs:
+                        launch(target_id, self._merge_inputs(target_id, inputs.pop(target_id)))
+                    else:
+                        # Nothing reached this node; propagate the skip downstream
+                        started.add(target_id)
+                        stack.append((target_id, None))
+
+        try:
+            for node_id in plan.entry_nodes:
+                launch(node_id, initial_data)
+
+            while tasks:
+                node_id, result = await results.get()
+                del tasks[node_id]
+                node_data[node_id] = result
+                settle(node_id, result)
+                if isinstance(result.get("data"), RecordStream):
+                    result["data"].start()
+
+            # Streamed outputs finish after their consumers were launched
+            for node_id, result in node_data.items():
+                stream = result.get("data")
+                if isinstance(stream, RecordStream):
+                    await self._finish_stream(node_id, result, stream)
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks.values(), return_exceptions=True)
+            for result in node_data.values():
+                if isinstance(result.get("data"), RecordStream):
+                    result["data"].cancel()
+            expressions.reset_outputs(outputs_token)
+
+        return node_data
+
+    async def _replay(self, node_id: str, result: Dict, results: asyncio.Queue):
+        """Report a checkpointed result without running the node"""
+        logger.info(f"Reusing checkpointed result of node {node_id}")
+        results.put_nowait((node_id, result))
+
+    async def _run_one(self, node_id: str, input_data: Any, results: asyncio.Queue):
+        """Run a single node under the concurrency limits and report its result"""
+        node = self.plan.get_node(node_id)
+        ready_at = time.perf_counter()
+        try:
+            async with AsyncExitStack() as stack:
+                # Wait for the workflow's own limit first, so nodes held back by
+                # it do not sit on global slots other workflows could use
+                if self.semaphore is not None:
+                    await stack.enter_async_context(self.semaphore)
+                if self.global_semaphore is not None:
+                    await stack.enter_async_context(self.global_semaphore)
+                result = await self.run_node(node, input_data, time.perf_counter() - ready_at)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error scheduling node {node_id}: {e}")
+            result = {"node_id": node_id, "success": False, "error": str(e)}
+        results.put_nowait((node_id, result))
+
+    async def _finish_stream(self, node_id: str, result: Dict, stream: RecordStream):
+        """Drain a stream and replace it in the node result
+
+        Final nodes keep their records; for intermediate nodes the records
+        were already consumed downstream and only a summary is recorded.
+        """
+        if self.plan.get_successors(node_id):
+            stream.discard()
+            await stream.wait_closed()
+            data = stream.summary()
+        else:
+            try:
+                data = await stream.materialize()
+            except RuntimeError:
+                data = None
+        if stream.error is not None:
+            result["success"] = False
+            result["error"] = str(stream.error)
+            result.pop("data", None)
+        else:
+            result["data"] = data
+
+    def _merge_inputs(self, node_id: str, received: Dict[str, Any]) -> Any:
+        """Merge parent outputs in declaration order
+
+        A single parent's output is passed through unchanged. With several
+        parents, dict outputs are shallow-merged (later parents win) and any
+        other output is stored under its parent's node id.
+        """
+        if len(received) == 1:
+            return next(iter(received.values()))
+
+        merged: Dict[str, Any] = {}
+        for parent_id in self.plan.get_predecessors(node_id):
+            if parent_id not in received:
+                continue
+            data = received[parent_id]
+            if isinstance(data, dict):
+                merged.update(data)
+            else:
+                merged[parent_id] = data
+        return merged
@@ -0,0 +1,62 @@
+"""
+Storage - Pluggable table storage engines for DatabaseNode
+"""
+
+import os
+import threading
+from typing import Dict, Tuple, Iterable
+
+from workflow_engine.storage.base import StorageBackend
+from workflow_engine.storage.table_cache import TableCache, table_cache
+from workflow_engine.storage.json_backend import JSONFileBackend
+from workflow_engine.storage.sqlite_backend import SQLiteBackend
+from workflow_engine.storage.jsonl_backend import JSONLBackend
+from workflow_engine.storage.batcher import WriteBatcher
+
+BACKENDS = {
+    "json": JSONFileBackend,
+    "sqlite": SQLiteBackend,
+    "jsonl": JSONLBackend,
+}
+
+_instances: Dict[Tuple[str, str], StorageBackend] = {}
+_instances_lock = threading.Lock()
+
+def get_backend(kind: str, storage_path: str, indexes: Iterable[str] = ()) -> StorageBackend:
+    """Get the process-wide backend instance for a storage path
+
+    Instances are shared so that every DatabaseNode (and every concurrent
+    execution) uses the same connection, locks and in-memory indexes.
+    """
+    backend_class = BACKENDS.get(kind)
+    if backend_class is None:
+        raise ValueError(f"Unknown storage backend: {kind}")
+    key = (kind, os.path.abspath(storage_path))
+    with _instances_lock:
+        backend = _instances.get(key)
+        if backend is None:
+            backend = backend_class(storage_path, indexes=indexes)
+            _instances[key] = backend
+        else:
+            backend.add_indexes(indexes)
+        return backend
+
+def close_backends():
+    """Close and forget every shared backend instance"""
+    with _instances_lock:
+        for backend in _instances.values():
+            backend.close()
+        _instances.clear()
+
+__all__ = [
+    "StorageBackend",
+    "TableCache",
+    "table_cache",
+    "JSONFileBackend",
+    "SQLiteBackend",
+    "JSONLBackend",
+    "WriteBatcher",
+    "BACKENDS",
+    "get_backend",
+    "close_backends",
+]
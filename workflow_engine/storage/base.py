@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Storage Backend - Interface shared by DatabaseNode storage engines
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple, Iterable
+
+# Fields used to identify a record when upserting, in priority order
+ID_FIELDS = ("id", "video_id", "url")
+
+def record_identity(record: Dict[str, Any]) -> Any:
+    """Get the identity of a record (its id, video_id or url)"""
+    return record.get("id") or record.get("video_id") or record.get("url")
+
+def merge_record(existing: Optional[Dict], record: Dict[str, Any], record_id: Any) -> Dict[str, Any]:
+    """Build the stored form of an upserted record
+
+    Updates merge into the existing record and stamp updated_at; inserts
+    stamp id and created_at. Always returns a new dict; neither argument
+    is modified.
+    """
+    if existing is not None:
+        return {**existing, **record, "id": record_id, "updated_at": datetime.now().isoformat()}
+    return {**record, "id": record_id, "created_at": datetime.now().isoformat()}
+
+class StorageBackend(ABC):
+    """Base class for table storage used by DatabaseNode
+
+    Every method is synchronous and thread-safe; tables are created on
+    first use.
+    """
+
+    def __init__(self, storage_path: str, indexes: Iterable[str] = ()):
+        self.storage_path = storage_path
+        self.indexes = tuple(dict.fromkeys(tuple(ID_FIELDS) + tuple(indexes)))
+        os.makedirs(storage_path, exist_ok=True)
+
+    @abstractmethod
+    def read_all(self, table: str) -> List[Dict[str, Any]]:
+        """Read every record of a table"""
+        pass
+
+    @abstractmethod
+    def find(self, table: str, key: str, value: Any, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Find records whose field equals value"""
+        pass
+
+    @abstractmethod
+    def upsert_many(self, table: str, records: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], bool]]:
+        """Insert or update records atomically, returning (stored record, updated) pairs"""
+        pass
+
+    def find_one(self, table: str, key: str, value: Any) -> Optional[Dict[str, Any]]:
+        """Find the first record whose field equals value"""
+        found = self.find(table, key, value, limit=1)
+        return found[0] if found else None
+
+    def upsert(self, table: str, record: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """Insert or update a single record"""
+        return self.upsert_many(table, [record])[0]
+
+    def add_indexes(self, fields: Iterable[str]) -> List[str]:
+        """Index additional fields, returning the ones that were not indexed yet"""
+        added = [field for field in dict.fromkeys(fields) if field not in self.indexes]
+        self.indexes += tuple(added)
+        return added
+
+    def close(self):
+        """Release resources held by the backend"""
+        pass
+
+    def _legacy_path(self, table: str) -> str:
+        """Path of the whole-file JSON table used by the default backend"""
+        return os.path.join(self.storage_path, f"{table}.json")
+
+    def _load_legacy(self, table: str) -> List[Dict[str, Any]]:
+        """Load records of a whole-file JSON table, so switching backends keeps existing data"""
+        path = self._legacy_path(table)
+        if not os.path.exists(path):
+            return []
+        with open(path, 'r') as f:
+            return json.load(f)
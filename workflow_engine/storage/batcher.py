@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Write Batcher - Coalesces DatabaseNode upserts into batched table writes
+"""
+
+import asyncio
+import logging
+from typing import Dict, Any, List, Tuple
+
+from workflow_engine.storage.base import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+class _PendingBatch:
+    """Records waiting to be written to one table"""
+
+    __slots__ = ("backend", "table", "items", "timer")
+
+    def __init__(self, backend: StorageBackend, table: str):
+        self.backend = backend
+        self.table = table
+        self.items: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self.timer = None
+
+class WriteBatcher:
+    """Collects upserts per table and applies them in one upsert_many call
+
+    When no write to a table is in flight, a batch is written on the next
+    event loop iteration, so records submitted together share it without
+    waiting. While a write is in flight new records accumulate and are
+    written when it completes, when the batch holds max_batch_size records,
+    or max_delay seconds after its first record arrived, whichever comes
+    first. Every caller's future resolves with its own (stored record,
+    updated) result.
+    """
+
+    def __init__(self, max_batch_size: int = 100, max_delay: float = 0.05):
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._pending: Dict[Tuple[int, str], _PendingBatch] = {}
+        # Writes in flight per table
+        self._in_flight: Dict[Tuple[int, str], int] = {}
+        self._flushing: set = set()
+        self.batches = 0
+        self.records = 0
+
+    async def submit(self, backend: StorageBackend, table: str, record: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """Queue a record for upsert and wait for the batch containing it"""
+        return await self._enqueue(backend, table, record)
+
+    async def submit_many(
+        self, backend: StorageBackend, table: str, records: List[Dict[str, Any]]
+    ) -> List[Tuple[Dict[str, Any], bool]]:
+        """Queue several records at once and wait for all of them"""
+        return list(await asyncio.gather(*[self._enqueue(backend, table, record) for record in records]))
+
+    def _enqueue(self, backend: StorageBackend, table: str, record: Dict[str, Any]) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        key = (id(backend), table)
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = _PendingBatch(backend, table)
+            self._pending[key] = batch
+            if self._in_flight.get(key):
+                batch.timer = loop.call_later(self.max_delay, self._schedule_flush, key)
+            else:
+                # Nothing to wait for; write once this iteration's submitters joined
+                batch.timer = loop.call_soon(self._schedule_flush, key)
+
+        future = loop.create_future()
+        batch.items.append((record, future))
+        if len(batch.items) >= self.max_batch_size:
+            self._schedule_flush(key)
+        return future
+
+    def _schedule_flush(self, key: Tuple[int, str]):
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        self._in_flight[key] = self._in_flight.get(key, 0) + 1
+        task = asyncio.ensure_future(self._write(batch))
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+        task.add_done_callback(lambda _: self._write_done(key))
+
+    def _write_done(self, key: Tuple[int, str]):
+        self._in_flight[key] -= 1
+        if not self._in_flight[key]:
+            del self._in_flight[key]
+            # Records that queued up behind the write go out now
+            if key in self._pending:
+                self._schedule_flush(key)
+
+    async def _write(self, batch: _PendingBatch):
+        records = [record for record, _ in batch.items]
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(None, batch.backend.upsert_many, batch.table, records)
+        except Exception as e:
+            logger.error(f"Batched write of {len(records)} records to '{batch.table}' failed: {e}")
+            for _, future in batch.items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.batches += 1
+        self.records += len(records)
+        for (_, future), result in zip(batch.items, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def flush(self):
+        """Write every pending batch now and wait for all writes to finish"""
+        for key in list(self._pending):
+            self._schedule_flush(key)
+        if self._flushing:
+            await asyncio.gather(*list(self._flushing), return_exceptions=True)
+
+    async def close(self):
+        """Flush pending writes; called on engine shutdown"""
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Batches written and records they contained"""
+        return {
+            "batches": self.batches,
+            "records": self.records,
+            "pending": sum(len(batch.items) for batch in self._pending.values()),
+        }
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+JSON File Backend - One JSON array file per table (the original DatabaseNode format)
+"""
+
+import json
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+from workflow_engine.file_io import atomic_write
+from workflow_engine.storage.base import StorageBackend, ID_FIELDS, record_identity, merge_record
+from workflow_engine.storage.table_cache import CachedTable, TableCache, table_cache
+
+class JSONFileBackend(StorageBackend):
+    """Stores each table as `<table>.json`, rewriting the file on every write
+
+    Parsed tables are kept in the shared TableCache, so repeated reads only
+    re-parse a file after it changed on disk.
+    """
+
+    def __init__(self, storage_path: str, indexes=(), cache: TableCache = None):
+        super().__init__(storage_path, indexes)
+        self.cache = cache if cache is not None else table_cache
+        self._lock = threading.RLock()
+
+    def _path(self, table: str) -> str:
+        return self._legacy_path(table)
+
+    def _load(self, table: str) -> Optional[CachedTable]:
+        return self.cache.get(self._path(table))
+
+    def _save(self, table: str, records: List[Dict[str, Any]]):
+        path = self._path(table)
+        # Replace the file atomically so readers never see a half-written table
+        atomic_write(path, json.dumps(records, indent=2), fsync=False)
+        self.cache.put(path, records)
+
+    def read_all(self, table: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            cached = self._load(table)
+        return [dict(record) for record in cached.records] if cached is not None else []
+
+    def find(self, table: str, key: str, value: Any, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            cached = self._load(table)
+        if cached is None:
+            return []
+        found = cached.lookup(key, value)
+        return found[:limit] if limit is not None else found
+
+    def upsert_many(self, table: str, records: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], bool]]:
+        with self._lock:
+            cached = self._load(table)
+            stored = list(cached.records) if cached is not None else []
+
+            # Position of the first record holding each identity value
+            positions: Dict[Any, int] = {}
+            if cached is not None:
+                for field in ID_FIELDS:
+                    for value, found in cached.index(field).items():
+                        if value not in positions or found[0] < positions[value]:
+                            positions[value] = found[0]
+
+            results = []
+            for record in records:
+                record_id = record_identity(record)
+                position = positions.get(record_id) if _hashable(record_id) else None
+                if position is not None:
+                    stored[position] = merge_record(stored[position], record, record_id)
+                    results.append((dict(stored[position]), True))
+                    continue
+                merged = merge_record(None, record, record_id)
+                stored.append(merged)
+                for field in ID_FIELDS:
+                    value = merged.get(field)
+                    if value is not None and _hashable(value):
+                        positions.setdefault(value, len(stored) - 1)
+                results.append((dict(merged), False))
+
+            self._save(table, stored)
+            return results
+
+def _hashable(value: Any) -> bool:
+    return not isinstance(value, (dict, list))
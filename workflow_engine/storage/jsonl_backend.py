@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+JSONL Backend - Append-only, log-structured table storage with compaction
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+from workflow_engine.storage.base import StorageBackend, ID_FIELDS, record_identity, merge_record
+
+logger = logging.getLogger(__name__)
+
+class _TableLog:
+    """In-memory state of one table log: live records plus secondary indexes"""
+
+    def __init__(self, path: str, indexes: Tuple[str, ...]):
+        self.path = path
+        self.records: Dict[int, Dict[str, Any]] = {}
+        # field -> value -> ordered set (dict) of record keys
+        self.indexes: Dict[str, Dict[Any, Dict[int, None]]] = {field: {} for field in indexes}
+        self.next_key = 0
+        self.entries = 0
+        self.offset = 0
+
+    def put(self, key: int, record: Dict[str, Any]):
+        old = self.records.get(key)
+        if old is not None:
+            self._unindex(key, old)
+        self.records[key] = record
+        for field, index in self.indexes.items():
+            value = _index_value(record.get(field))
+            if value is not None:
+                index.setdefault(value, {})[key] = None
+        self.next_key = max(self.next_key, key + 1)
+
+    def _unindex(self, key: int, record: Dict[str, Any]):
+        for field, index in self.indexes.items():
+            value = _index_value(record.get(field))
+            keys = index.get(value)
+            if keys is not None and key in keys:
+                del keys[key]
+                if not keys:
+                    del index[value]
+
+    def add_index(self, field: str):
+        """Build a hash index for a field over the live records"""
+        index: Dict[Any, Dict[int, None]] = {}
+        for key, record in self.records.items():
+            value = _index_value(record.get(field))
+            if value is not None:
+                index.setdefault(value, {})[key] = None
+        self.indexes[field] = index
+
+    def lookup(self, field: str, value: Any) -> List[int]:
+        """Keys of records whose field equals value, in insertion order"""
+        index = self.indexes.get(field)
+        if index is not None:
+            indexed = _index_value(value)
+            keys = index.get(indexed, ()) if indexed is not None else ()
+            return sorted(key for key in keys if self.records[key].get(field) == value)
+        return [key for key, record in self.records.items() if record.get(field) == value]
+
+class JSONLBackend(StorageBackend):
+    """Stores each table as an append-only `<table>.jsonl` log
+
+    Writes append one line per upserted record instead of rewriting the
+    table. The log is replayed into memory (with hash indexes on the
+    configured fields) when a table is first opened and is compacted once
+    superseded entries outnumber live records.
+
+    The backend is single-process: after the first replay the in-memory
+    state is authoritative, so a table must not be written by another
+    process at the same time (use the sqlite backend for that).
+    """
+
+    def __init__(self, storage_path: str, indexes=(), compact_ratio: float = 2.0, compact_min_entries: int = 1000):
+        super().__init__(storage_path, indexes)
+        self.compact_ratio = compact_ratio
+        self.compact_min_entries = compact_min_entries
+        self._lock = threading.RLock()
+        self._tables: Dict[str, _TableLog] = {}
+
+    def _path(self, table: str) -> str:
+        return os.path.join(self.storage_path, f"{table}.jsonl")
+
+    def _open(self, table: str) -> _TableLog:
+        """Get the table state, replaying its log the first time the table is used"""
+        log = self._tables.get(table)
+        if log is not None:
+            return log
+
+        path = self._path(table)
+        log = _TableLog(path, self.indexes)
+        self._tables[table] = log
+        if not os.path.exists(path):
+            legacy = self._load_legacy(table)
+            if legacy:
+                logger.info(f"Importing {len(legacy)} records into JSONL table '{table}'")
+                self._append(log, [(i, record) for i, record in enumerate(legacy)])
+            return log
+
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partially written entry (crash mid-append)
+                entry = json.loads(line)
+                log.put(entry["k"], entry["r"])
+                log.entries += 1
+                log.offset += len(line)
+        if log.offset < os.path.getsize(path):
+            # Drop the torn entry so the next append starts on a fresh line
+            with open(path, 'r+b') as f:
+                f.truncate(log.offset)
+        return log
+
+    def _append(self, log: _TableLog, entries: List[Tuple[int, Dict[str, Any]]]):
+        """Append entries to the log in a single write and apply them in memory"""
+        payload = "".join(json.dumps({"k": key, "r": record}) + "\n" for key, record in entries)
+        with open(log.path, 'a', encoding="utf-8", newline="\n") as f:
+            f.write(payload)
+        for key, record in entries:
+            log.put(key, record)
+        log.entries += len(entries)
+        log.offset += len(payload.encode("utf-8"))
+
+    def add_indexes(self, fields) -> List[str]:
+        with self._lock:
+            added = super().add_indexes(fields)
+            for log in self._tables.values():
+                for field in added:
+                    log.add_index(field)
+            return added
+
+    def read_all(self, table: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            log = self._open(table)
+            return [dict(log.records[key]) for key in sorted(log.records)]
+
+    def find(self, table: str, key: str, value: Any, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            log = self._open(table)
+            keys = log.lookup(key, value)
+            if limit is not None:
+                keys = keys[:limit]
+            return [dict(log.records[k]) for k in keys]
+
+    def upsert_many(self, table: str, records: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], bool]]:
+        with self._lock:
+            log = self._open(table)
+            results = []
+            entries: Dict[int, Dict[str, Any]] = {}
+            # identity value -> key, for records written earlier in this batch
+            pending_ids: Dict[Any, int] = {}
+            next_key = log.next_key
+            for record in records:
+                record_id = record_identity(record)
+                key = None
+                if record_id is not None:
+                    matches = [k for field in ID_FIELDS for k in log.lookup(field, record_id)[:1]]
+                    pending_key = pending_ids.get(_index_value(record_id))
+                    if pending_key is not None:
+                        matches.append(pending_key)
+                    key = min(matches) if matches else None
+                if key is not None:
+                    existing = entries.get(key, log.records.get(key))
+                    merged = merge_record(existing, record, record_id)
+                    results.append((dict(merged), True))
+                else:
+                    key = next_key
+                    next_key += 1
+                    merged = merge_record(None, record, record_id)
+                    results.append((dict(merged), False))
+                entries[key] = merged
+                for field in ID_FIELDS:
+                    value = _index_value(merged.get(field))
+                    if value is not None:
+                        pending_ids.setdefault(value, key)
+
+            self._append(log, list(entries.items()))
+            self._maybe_compact(log)
+            return results
+
+    def compact(self, table: str):
+        """Rewrite a table log keeping only live records"""
+        with self._lock:
+            self._compact(self._open(table))
+
+    def _maybe_compact(self, log: _TableLog):
+        live = len(log.records)
+        if log.entries >= self.compact_min_entries and log.entries > live * self.compact_ratio:
+            self._compact(log)
+
+    def _compact(self, log: _TableLog):
+        tmp_path = log.path + ".compact"
+        with open(tmp_path, 'w', encoding="utf-8", newline="\n") as f:
+            for key in sorted(log.records):
+                f.write(json.dumps({"k": key, "r": log.records[key]}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, log.path)
+        logger.debug(f"Compacted {log.path}: {log.entries} entries -> {len(log.records)}")
+        log.entries = len(log.records)
+        log.offset = os.path.getsize(log.path)
+
+def _index_value(value: Any) -> Any:
+    """Hashable form of a field value for the hash indexes"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True)
+    return value
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+SQLite Backend - Indexed table storage using the standard library sqlite3 module
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+from workflow_engine.storage.base import StorageBackend, ID_FIELDS, record_identity, merge_record
+
+logger = logging.getLogger(__name__)
+
+class SQLiteBackend(StorageBackend):
+    """Stores every table in one SQLite database with JSON records
+
+    Each configured index becomes an expression index on
+    json_extract(data, '$.<field>'), so lookups by url, video_id or status
+    are O(log n) instead of a scan of the whole table. Writes run inside a
+    transaction and the database uses WAL so readers are never blocked.
+    """
+
+    def __init__(self, storage_path: str, indexes=(), database: str = "workflow_data.sqlite3"):
+        super().__init__(storage_path, indexes)
+        self.db_path = os.path.join(storage_path, database)
+        self._lock = threading.RLock()
+        self._tables = set()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+
+    def _ensure_table(self, table: str) -> str:
+        """Create the table and its indexes on first use, returning its quoted name"""
+        name = _quote(f"t_{table}")
+        if table in self._tables:
+            return name
+
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (f"t_{table}",)
+        ).fetchone()
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {name} (rowid INTEGER PRIMARY KEY, data TEXT NOT NULL)"
+        )
+        for field in self.indexes:
+            self._create_index(table, field)
+        self._tables.add(table)
+
+        if not exists:
+            legacy = self._load_legacy(table)
+            if legacy:
+                logger.info(f"Importing {len(legacy)} records into SQLite table '{table}'")
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._conn.executemany(
+                        f"INSERT INTO {name} (data) VALUES (?)",
+                        ((json.dumps(record),) for record in legacy),
+                    )
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+        return name
+
+    def _create_index(self, table: str, field: str):
+        index_name = _quote(f"ix_{table}_{field}")
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {index_name} ON {_quote(f't_{table}')} "
+            f"(json_extract(data, {_json_path_literal(field)}))"
+        )
+
+    def add_indexes(self, fields) -> List[str]:
+        with self._lock:
+            added = super().add_indexes(fields)
+            for table in self._tables:
+                for field in added:
+                    self._create_index(table, field)
+            return added
+
+    def read_all(self, table: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            name = self._ensure_table(table)
+            rows = self._conn.execute(f"SELECT data FROM {name} ORDER BY rowid").fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def find(self, table: str, key: str, value: Any, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            name = self._ensure_table(table)
+            rows = self._select(name, key, value, limit)
+        return [json.loads(row[1]) for row in rows]
+
+    def _select(self, name: str, key: str, value: Any, limit: Optional[int]) -> List[Tuple[int, str]]:
+        """Select (rowid, data) rows whose field equals value"""
+        sql = f"SELECT rowid, data FROM {name} WHERE json_extract(data, {_json_path_literal(key)})"
+        if value is None:
+            sql += " IS NULL"
+            params: Tuple = ()
+        elif isinstance(value, (dict, list)):
+            sql += " = json(?)"
+            params = (json.dumps(value),)
+        else:
+            sql += " = ?"
+            params = (value,)
+        sql += " ORDER BY rowid"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        rows = self._conn.execute(sql, params).fetchall()
+        if isinstance(value, bool):
+            # SQLite stores booleans as 0/1; keep Python equality semantics
+            rows = [row for row in rows if json.loads(row[1]).get(key) is value]
+        return rows
+
+    def upsert_many(self, table: str, records: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], bool]]:
+        with self._lock:
+            name = self._ensure_table(table)
+            results = []
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for record in records:
+                    record_id = record_identity(record)
+                    row = None
+                    if record_id is not None:
+                        for field in ID_FIELDS:
+                            rows = self._select(name, field, record_id, 1)
+                            if rows and (row is None or rows[0][0] < row[0]):
+                                row = rows[0]
+                    if row is not None:
+                        merged = merge_record(json.loads(row[1]), record, record_id)
+                        self._conn.execute(
+                            f"UPDATE {name} SET data = ? WHERE rowid = ?", (json.dumps(merged), row[0])
+                        )
+                        results.append((merged, True))
+                    else:
+                        merged = merge_record(None, record, record_id)
+                        self._conn.execute(f"INSERT INTO {name} (data) VALUES (?)", (json.dumps(merged),))
+                        results.append((merged, False))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return results
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def _quote(identifier: str) -> str:
+    """Quote an SQL identifier"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+def _json_path_literal(field: str) -> str:
+    """SQL string literal for the JSON path of a top-level field"""
+    path = '$."' + field.replace('"', '\\"') + '"'
+    return "'" + path.replace("'", "''") + "'"
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Table Cache - Process-wide cache of parsed JSON tables with change detection
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+class CachedTable:
+    """Parsed records of one table file plus lazily built hash indexes"""
+
+    __slots__ = ("records", "mtime_ns", "size", "_indexes")
+
+    def __init__(self, records: List[Dict[str, Any]], mtime_ns: int, size: int):
+        self.records = records
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self._indexes: Dict[str, Dict[Any, List[int]]] = {}
+
+    def index(self, key: str) -> Dict[Any, List[int]]:
+        """Get the value -> positions index of a field, building it on first use"""
+        index = self._indexes.get(key)
+        if index is None:
+            index = {}
+            for position, record in enumerate(self.records):
+                value = record.get(key)
+                if value is not None and not isinstance(value, (dict, list)):
+                    index.setdefault(value, []).append(position)
+            self._indexes[key] = index
+        return index
+
+    def lookup(self, key: str, value: Any) -> List[Dict[str, Any]]:
+        """Copies of the records whose field equals value, in file order"""
+        if value is None or isinstance(value, (dict, list)):
+            return [dict(record) for record in self.records if record.get(key) == value]
+        return [
+            dict(self.records[position])
+            for position in self.index(key).get(value, ())
+            if self.records[position].get(key) == value
+        ]
+
+class TableCache:
+    """LRU cache of parsed JSON table files keyed by path
+
+    Entries are invalidated when the file's mtime or size changes, and
+    evicted least-recently-used once the total size of cached files
+    exceeds max_bytes. Cached records are shared, so callers hand out
+    copies (CachedTable.lookup does) and never modify them in place.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CachedTable]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get(self, path: str) -> Optional[CachedTable]:
+        """Get the parsed table at path, or None when the file does not exist"""
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._discard(path)
+            return None
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                if entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+                    self.hits += 1
+                    self._entries.move_to_end(path)
+                    return entry
+                self.invalidations += 1
+                self._discard(path)
+            self.misses += 1
+
+        with open(path, 'r') as f:
+            records = json.load(f)
+        entry = CachedTable(records, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            self._store(path, entry)
+        return entry
+
+    def put(self, path: str, records: List[Dict[str, Any]]) -> CachedTable:
+        """Record a table that was just written to path (write-through)"""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        entry = CachedTable(records, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            self._discard(path)
+            self._store(path, entry)
+        return entry
+
+    def invalidate(self, path: Optional[str] = None):
+        """Drop one cached table, or all of them"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._bytes = 0
+            else:
+                self._discard(os.path.abspath(path))
+
+    def _store(self, path: str, entry: CachedTable):
+        if entry.size > self.max_bytes:
+            return
+        self._entries[path] = entry
+        self._bytes += entry.size
+        while self._bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+
+    def _discard(self, path: str):
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+                "tables": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+# Shared by every JSONFileBackend in the process
+table_cache = TableCache()
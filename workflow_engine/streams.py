@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Record Streams - Incremental node output consumed by downstream nodes
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+def is_async_iterable(value: Any) -> bool:
+    """Whether a node returned an async iterator/generator instead of a value"""
+    return hasattr(value, "__aiter__") and not isinstance(value, (str, bytes, dict, list))
+
+class StreamSubscription:
+    """One consumer's position in a RecordStream"""
+
+    def __init__(self, stream: "RecordStream"):
+        self._stream = stream
+        self.position = stream._offset
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Any:
+        if self.closed:
+            raise StopAsyncIteration
+        stream = self._stream
+        while self.position >= stream.count:
+            if stream.closed:
+                self.close()
+                if stream.error is not None:
+                    raise RuntimeError(f"Stream '{stream.name}' failed: {stream.error}")
+                raise StopAsyncIteration
+            await stream._wait_changed()
+        item = stream._buffer[self.position - stream._offset]
+        self.position += 1
+        stream._advanced()
+        return item
+
+    def close(self):
+        """Stop consuming; the producer no longer waits for this consumer"""
+        if not self.closed:
+            self.closed = True
+            self._stream._unsubscribe(self)
+
+class RecordStream:
+    """Drives a node's async iterator and fans its records out to consumers
+
+    The source is pumped by a background task once the scheduler has
+    reserved the consumers it will deliver the stream to and called start();
+    records are buffered until every reserved consumer has subscribed and
+    read them, then dropped. The producer pauses while the slowest active
+    consumer is max_buffer records behind, so memory stays bounded no matter
+    how many records flow through. A stream with no consumers (the output of
+    a final node) keeps all of its records.
+    """
+
+    def __init__(
+        self,
+        source: AsyncIterator[Any],
+        name: str = "stream",
+        max_buffer: int = 100,
+        on_close: Optional[Callable[[], None]] = None,
+    ):
+        self.name = name
+        self.max_buffer = max(1, max_buffer)
+        self.count = 0
+        self.error: Optional[BaseException] = None
+        self.closed = False
+        self._buffer: deque = deque()
+        self._offset = 0
+        self._reserved = 0
+        self._discard = False
+        self._subscriptions: List[StreamSubscription] = []
+        self._on_close = on_close
+        self._changed = asyncio.Event()
+        self._started = asyncio.Event()
+        self._task = asyncio.ensure_future(self._pump(source))
+
+    async def _pump(self, source: AsyncIterator[Any]):
+        try:
+            await self._started.wait()
+            async for item in source:
+                self.count += 1
+                if self._discard:
+                    self._offset += 1
+                    continue
+                self._buffer.append(item)
+                self._notify()
+                while self._should_pause():
+                    await self._wait_changed()
+        except asyncio.CancelledError:
+            self.error = asyncio.CancelledError()
+            raise
+        except Exception as e:
+            logger.error(f"Stream '{self.name}' failed: {e}")
+            self.error = e
+        finally:
+            self.closed = True
+            self._notify()
+            if self._on_close is not None:
+                self._on_close()
+
+    def _should_pause(self) -> bool:
+        """Backpressure: wait for the slowest consumer to catch up"""
+        if self._subscriptions:
+            slowest = min(sub.position for sub in self._subscriptions)
+            return self.count - slowest >= self.max_buffer
+        # Nobody is reading yet; hold at a full buffer until a consumer arrives
+        return self._reserved > 0 and len(self._buffer) >= self.max_buffer
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def _wait_changed(self):
+        await self._changed.wait()
+
+    def _advanced(self):
+        self._trim()
+        self._notify()
+
+    def _trim(self):
+        """Drop records every current and future consumer has read"""
+        if self._reserved or not self._subscriptions:
+            return
+        slowest = min(sub.position for sub in self._subscriptions)
+        while self._offset < slowest:
+            self._buffer.popleft()
+            self._offset += 1
+
+    def _unsubscribe(self, subscription: StreamSubscription):
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+        if not self._subscriptions and not self._reserved:
+            self.discard()
+        else:
+            self._trim()
+            self._notify()
+
+    def reserve(self, consumers: int = 1):
+        """Announce consumers that will subscribe later"""
+        self._reserved += consumers
+
+    def start(self):
+        """Begin pumping the source once consumers have been reserved"""
+        self._started.set()
+
+    def release(self):
+        """Give up a reservation without subscribing (the consumer did not run)"""
+        if self._reserved:
+            self._reserved -= 1
+        if not self._subscriptions and not self._reserved:
+            self.discard()
+        else:
+            self._trim()
+            self._notify()
+
+    def discard(self):
+        """No one will read further; drop buffered and future records"""
+        self._reserved = 0
+        self._discard = True
+        self._offset += len(self._buffer)
+        self._buffer.clear()
+        self._notify()
+
+    def subscribe(self) -> StreamSubscription:
+        """Start consuming from the first record, claiming a reservation"""
+        if self._offset > 0:
+            raise RuntimeError(f"Stream '{self.name}' was already consumed")
+        if self._reserved:
+            self._reserved -= 1
+        subscription = StreamSubscription(self)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    async def materialize(self) -> List[Any]:
+        """Read every record into a list"""
+        return [item async for item in self.subscribe()]
+
+    @property
+    def items(self) -> List[Any]:
+        """Records still buffered (all records for a stream nobody consumed)"""
+        return list(self._buffer)
+
+    async def wait_closed(self):
+        """Wait until the source is exhausted (or failed)"""
+        await asyncio.wait({self._task})
+
+    def summary(self) -> Dict[str, Any]:
+        """Placeholder recorded for a stream's records in execution results"""
+        return {"streamed": True, "records": self.count}
+
+    def cancel(self):
+        """Stop pumping the source"""
+        self._task.cancel()
+
+def input_streams(value: Any) -> List[RecordStream]:
+    """Streams in a node input, including those merged into a dict"""
+    if isinstance(value, RecordStream):
+        return [value]
+    if isinstance(value, dict):
+        return [v for v in value.values() if isinstance(v, RecordStream)]
+    return []
+
+async def materialize_streams(value: Any) -> Any:
+    """Materialize streams in a node input, including those merged into a dict"""
+    if isinstance(value, RecordStream):
+        return await value.materialize()
+    if isinstance(value, dict) and any(isinstance(v, RecordStream) for v in value.values()):
+        return {k: (await v.materialize() if isinstance(v, RecordStream) else v) for k, v in value.items()}
+    return value
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script for parameter templates in format strings and items mode
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+
+from workflow_engine.config import WorkflowConfigManager
+from workflow_engine.expressions import compile_template
+from workflow_engine.workflow_engine import WorkflowEngine
+
+RECORDS = [{"name": "Ada", "want": "yes"}, {"name": "Bob", "want": "no"}]
+
+async def _run(workflow_def: dict, initial_data) -> dict:
+    with tempfile.TemporaryDirectory() as work_dir:
+        config_path = os.path.join(work_dir, "workflow_config.json")
+        with open(config_path, "w") as f:
+            json.dump({"history": {"spill": False}, "journal": {"enabled": False}, "cache": {"disk": False}}, f)
+        engine = WorkflowEngine(WorkflowConfigManager(config_path))
+        try:
+            assert engine.load_workflow("test", workflow_def), "workflow failed to load"
+            execution_id = await engine.execute_workflow("test", initial_data)
+            execution = await engine.wait_for_execution(execution_id, timeout=5)
+            assert execution["status"] == "completed"
+            return execution["data"]
+        finally:
+            await engine.shutdown()
+
+def _workflow(node: dict) -> dict:
+    return {
+        "name": "test",
+        "nodes": [{"id": "trigger", "type": "trigger", "parameters": {}}, node],
+        "connections": {"trigger": [node["id"]]}
+    }
+
+def test_format_string_brace_escapes():
+    data = asyncio.run(_run(_workflow({
+        "id": "fmt",
+        "type": "transform",
+        "parameters": {"operation": "format_string", "template": '{{"name": "{name}", "id": "{{$json.id}}"}}'}
+    }), {"name": "Ada", "id": 7}))
+    assert data["fmt"]["data"] == '{"name": "Ada", "id": "7"}', data["fmt"]
+
+def test_items_mode_merge_renders_per_record():
+    data = asyncio.run(_run(_workflow({
+        "id": "merge",
+        "type": "transform",
+        "mode": "items",
+        "parameters": {"operation": "merge", "merge_data": {"greeting": "Hi {{$json.name}}"}}
+    }), {"items": RECORDS}))
+    assert [item["greeting"] for item in data["merge"]["data"]] == ["Hi Ada", "Hi Bob"], data["merge"]
+
+def test_items_mode_condition_renders_per_record():
+    data = asyncio.run(_run(_workflow({
+        "id": "check",
+        "type": "condition",
+        "mode": "items",
+        "parameters": {"condition_type": "equals", "field": "want", "value": "{{$json.want}}"}
+    }), {"items": RECORDS}))
+    assert [item["condition_result"] for item in data["check"]["data"]] == [True, True], data["check"]
+
+def test_braces_without_dollar_are_literal():
+    data = asyncio.run(_run(_workflow({
+        "id": "merge",
+        "type": "transform",
+        "parameters": {"operation": "merge", "merge_data": {
+            "prompt": "Write mustache like {{name}} for {{$json.title}}",
+            "body": {"q": "{{ not json }}"}
+        }}
+    }), {"title": "Intro"}))
+    assert data["merge"]["data"]["prompt"] == "Write mustache like {{name}} for Intro", data["merge"]
+    assert data["merge"]["data"]["body"] == {"q": "{{ not json }}"}, data["merge"]
+
+def test_malformed_expression_fails():
+    for text in ("{{$json.}}", "Hi {{$name}}"):
+        try:
+            compile_template(text)
+        except ValueError:
+            continue
+        raise AssertionError(f"{text!r} compiled")
+
+if __name__ == "__main__":
+    test_format_string_brace_escapes()
+    test_items_mode_merge_renders_per_record()
+    test_items_mode_condition_renders_per_record()
+    test_braces_without_dollar_are_literal()
+    test_malformed_expression_fails()
+    print("✅ Expression tests passed")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for resuming executions from the journal
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+
+from workflow_engine.config import WorkflowConfigManager
+from workflow_engine.workflow_engine import WorkflowEngine
+from workflow_engine.nodes.base_node import BaseNode
+
+class CountingNode(BaseNode):
+    """Increments "v" and counts its runs"""
+
+    runs = 0
+
+    async def execute(self, input_data):
+        CountingNode.runs += 1
+        return {"v": input_data.get("v", 0) + 1}
+
+class MutatingSlowNode(BaseNode):
+    """Modifies its input in place, then sleeps for `delay` seconds"""
+
+    delay = 0.0
+
+    async def execute(self, input_data):
+        input_data["mutated"] = True
+        input_data["v"] = -1
+        await asyncio.sleep(MutatingSlowNode.delay)
+        return {"done": dict(input_data)}
+
+WORKFLOW = {
+    "name": "resume",
+    "nodes": [
+        {"id": "trigger", "type": "trigger", "parameters": {}},
+        {"id": "count", "type": "counting", "parameters": {}},
+        {"id": "slow", "type": "mutating_slow", "parameters": {}}
+    ],
+    "connections": {"trigger": ["count"], "count": ["slow"]}
+}
+
+def _make_engine(work_dir: str) -> WorkflowEngine:
+    config_path = os.path.join(work_dir, "workflow_config.json")
+    with open(config_path, "w") as f:
+        json.dump({
+            "journal": {"enabled": True, "path": os.path.join(work_dir, "journal"), "fsync_interval": 0.01},
+            "history": {"spill": False}
+        }, f)
+    engine = WorkflowEngine(WorkflowConfigManager(config_path))
+    engine.register_node_type("counting", CountingNode)
+    engine.register_node_type("mutating_slow", MutatingSlowNode)
+    return engine
+
+async def _interrupt_and_resume(work_dir: str):
+    CountingNode.runs = 0
+    MutatingSlowNode.delay = 5.0
+    engine = _make_engine(work_dir)
+    assert engine.load_workflow("resume", WORKFLOW)
+    execution_id = await engine.execute_workflow("resume", {"v": 41})
+    await asyncio.sleep(0.2)
+    # Shutting down mid-run keeps the journal of the unfinished execution
+    await engine.shutdown()
+    assert CountingNode.runs == 1
+
+    engine = _make_engine(work_dir)
+    try:
+        [state] = engine.journal.load_incomplete()
+        # The checkpoint holds the output as it was produced, not as mutated downstream
+        assert state["completed"]["count"]["data"] == {"v": 42}, state["completed"]["count"]
+
+        MutatingSlowNode.delay = 0.0
+        assert engine.load_workflow("resume", WORKFLOW)
+        assert await engine.resume_executions() == [execution_id]
+        execution = await engine.wait_for_execution(execution_id, timeout=5)
+
+        assert execution["status"] == "completed"
+        assert execution["resumed_nodes"] == ["trigger", "count"]
+        assert CountingNode.runs == 1, "checkpointed node ran again"
+        assert execution["data"]["slow"]["data"]["done"] == {"v": -1, "mutated": True}
+    finally:
+        await engine.shutdown()
+    assert not os.listdir(os.path.join(work_dir, "journal"))
+
+def test_interrupted_execution_resumes_from_checkpoints():
+    with tempfile.TemporaryDirectory() as work_dir:
+        asyncio.run(_interrupt_and_resume(work_dir))
+
+if __name__ == "__main__":
+    test_interrupted_execution_resumes_from_checkpoints()
+    print("✅ Journal tests passed")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test script for the DatabaseNode storage backends
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from workflow_engine.config import WorkflowConfigManager
+from workflow_engine.workflow_engine import WorkflowEngine
+from workflow_engine.storage.batcher import WriteBatcher
+from workflow_engine.storage.jsonl_backend import JSONLBackend
+
+def _line_count(path: str) -> int:
+    with open(path, "rb") as f:
+        return sum(1 for _ in f)
+
+def test_jsonl_replay_restores_records_and_indexes():
+    with tempfile.TemporaryDirectory() as storage_path:
+        backend = JSONLBackend(storage_path, indexes=("channel",))
+        backend.upsert_many("videos", [
+            {"video_id": "a", "channel": "x", "views": 1},
+            {"video_id": "b", "channel": "y", "views": 2},
+        ])
+        backend.upsert("videos", {"video_id": "a", "views": 10})
+
+        reopened = JSONLBackend(storage_path, indexes=("channel",))
+        records = reopened.read_all("videos")
+        assert [record["video_id"] for record in records] == ["a", "b"]
+        assert reopened.find_one("videos", "video_id", "a")["views"] == 10
+        assert [record["video_id"] for record in reopened.find("videos", "channel", "y")] == ["b"]
+
+        # New keys continue after the replayed ones
+        _, updated = reopened.upsert("videos", {"video_id": "c"})
+        assert not updated
+        assert [record["video_id"] for record in JSONLBackend(storage_path).read_all("videos")] == ["a", "b", "c"]
+
+def test_jsonl_replay_drops_torn_entry():
+    with tempfile.TemporaryDirectory() as storage_path:
+        JSONLBackend(storage_path).upsert("videos", {"video_id": "a"})
+        path = os.path.join(storage_path, "videos.jsonl")
+        with open(path, "a") as f:
+            f.write('{"k": 1, "r": {"video_id"')
+
+        backend = JSONLBackend(storage_path)
+        assert [record["video_id"] for record in backend.read_all("videos")] == ["a"]
+        backend.upsert("videos", {"video_id": "b"})
+        assert [record["video_id"] for record in JSONLBackend(storage_path).read_all("videos")] == ["a", "b"]
+
+def test_jsonl_compaction_keeps_live_records():
+    with tempfile.TemporaryDirectory() as storage_path:
+        backend = JSONLBackend(storage_path, compact_ratio=2.0, compact_min_entries=10)
+        for views in range(30):
+            backend.upsert_many("videos", [{"video_id": "a", "views": views}, {"video_id": "b", "views": -views}])
+
+        path = os.path.join(storage_path, "videos.jsonl")
+        assert _line_count(path) < 10, "log was not compacted"
+        for reader in (backend, JSONLBackend(storage_path)):
+            assert reader.find_one("videos", "video_id", "a")["views"] == 29
+            assert reader.find_one("videos", "video_id", "b")["views"] == -29
+            assert len(reader.read_all("videos")) == 2
+
+async def _concurrent_submits(storage_path: str):
+    batcher = WriteBatcher(max_batch_size=1000, max_delay=1.0)
+    backend = JSONLBackend(storage_path)
+    started = time.perf_counter()
+    await asyncio.gather(*(batcher.submit(backend, "videos", {"video_id": str(i)}) for i in range(50)))
+    # Submitted together: one write, without waiting out max_delay
+    assert time.perf_counter() - started < 0.5
+    assert batcher.get_stats()["batches"] == 1
+    assert len(backend.read_all("videos")) == 50
+
+def test_write_batcher_flushes_without_waiting():
+    with tempfile.TemporaryDirectory() as storage_path:
+        asyncio.run(_concurrent_submits(storage_path))
+
+async def _items_mode_write(work_dir: str):
+    config_path = os.path.join(work_dir, "workflow_config.json")
+    with open(config_path, "w") as f:
+        json.dump({
+            "workflows": {"storage_path": os.path.join(work_dir, "data")},
+            "database": {"batch_writes": True, "batch_max_delay": 1.0},
+            "history": {"spill": False},
+            "journal": {"enabled": False}
+        }, f)
+    engine = WorkflowEngine(WorkflowConfigManager(config_path))
+    try:
+        assert engine.load_workflow("save", {
+            "name": "save",
+            "nodes": [
+                {"id": "trigger", "type": "trigger", "parameters": {}},
+                {"id": "write", "type": "database", "mode": "items",
+                 "parameters": {"operation": "write", "table": "videos", "backend": "jsonl"}}
+            ],
+            "connections": {"trigger": ["write"]}
+        })
+        records = [{"video_id": str(i)} for i in range(100)]
+        started = time.perf_counter()
+        execution_id = await engine.execute_workflow("save", {"items": records})
+        execution = await engine.wait_for_execution(execution_id, timeout=10)
+        elapsed = time.perf_counter() - started
+
+        results = execution["data"]["write"]["data"]
+        assert len(results) == 100 and all(result["success"] for result in results)
+        assert results[0]["record"]["id"] == "0" and "created_at" in results[0]["record"]
+        assert engine.write_batcher.get_stats()["batches"] == 1
+        assert elapsed < 1.0, f"items-mode write took {elapsed:.2f}s"
+        assert len(JSONLBackend(os.path.join(work_dir, "data")).read_all("videos")) == 100
+    finally:
+        await engine.shutdown()
+
+def test_items_mode_write_is_one_batch():
+    with tempfile.TemporaryDirectory() as work_dir:
+        asyncio.run(_items_mode_write(work_dir))
+
+if __name__ == "__main__":
+    test_jsonl_replay_restores_records_and_indexes()
+    test_jsonl_replay_drops_torn_entry()
+    test_jsonl_compaction_keeps_live_records()
+    test_write_batcher_flushes_without_waiting()
+    test_items_mode_write_is_one_batch()
+    print("✅ Storage tests passed")
@@ -6,11 +6,28 @@ Workflow Engine - Core execution engine for workflows
 import asyncio
 import json
 import logging
-from typing import Dict, List, Any, Optional
+import time
+import uuid
+from typing import Dict, List, Any, Optional, Set
 from datetime import datetime
 from enum import Enum
 
-from workflow_engine.nodes.base_node import BaseNode
+from workflow_engine.plan import ExecutionPlan, compile_workflow
+from workflow_engine.scheduler import DAGScheduler
+from workflow_engine.http_pool import HTTPClientPool
+from workflow_engine.response_cache import ResponseCache
+from workflow_engine.coalescing import SingleFlight
+from workflow_engine.history import ExecutionHistory
+from workflow_engine.journal import ExecutionJournal, definition_hash
+from workflow_engine.executors import NodeExecutors, EXECUTION_CLASSES
+from workflow_engine.expressions import compile_parameters, bind_input, reset_input
+from workflow_engine.resilience import CircuitBreakers
+from workflow_engine.rate_limit import RateLimiters
+from workflow_engine.metrics import EngineMetrics, payload_size, count_cache_hits
+from workflow_engine.storage import WriteBatcher
+from workflow_engine.streams import RecordStream, is_async_iterable, input_streams, materialize_streams
+
+from workflow_engine.nodes.base_node import BaseNode, to_items
 from workflow_engine.nodes.http_node import HTTPNode
 from workflow_engine.nodes.ai_node import AINode
 from workflow_engine.nodes.transform_node import TransformNode
@@ -20,24 +37,92 @@ from workflow_engine.nodes.youtube_node import YouTubeNode
 from workflow_engine.nodes.database_node import DatabaseNode
 from workflow_engine.nodes.image_node import ImageNode
 from workflow_engine.nodes.voiceover_node import VoiceoverNode
+from workflow_engine.nodes.map_node import MapNode
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class WorkflowStatus(Enum):
     IDLE = "idle"
+    QUEUED = "queued"
     RUNNING = "running"
     PAUSED = "paused"
     COMPLETED = "completed"
+    CANCELLED = "cancelled"
     ERROR = "error"
 
+class ExecutionQueueFullError(ValueError):
+    """Raised when a workflow's execution wait queue is full"""
+    pass
+
+class _ExecutionSlots:
+    """Per-workflow execution concurrency limit with a bounded wait queue"""
+    
+    def __init__(self, max_running: int, max_queued: int):
+        self.max_running = max_running
+        self.max_queued = max_queued
+        self.semaphore = asyncio.Semaphore(max_running)
+        self.running = 0
+        self.queued = 0
+    
+    def reserve(self, workflow_id: str):
+        """Reserve a place, raising when both slots and queue are full"""
+        if self.running + self.queued >= self.max_running + self.max_queued:
+            raise ExecutionQueueFullError(
+                f"Workflow '{workflow_id}' already has {self.max_running} running and "
+                f"{self.max_queued} queued executions"
+            )
+        self.queued += 1
+
+class _NodeSet:
+    """Node instances of one compiled workflow, reused by every execution
+    
+    Instances are created when the workflow is loaded; their async setup()
+    runs once on first use and teardown() runs once the set has been
+    replaced (or the engine shuts down) and no execution still uses it.
+    """
+    
+    def __init__(self, workflow_id: str, instances: Dict[str, BaseNode]):
+        self.workflow_id = workflow_id
+        self.instances = instances
+        self.ready: Set[str] = set()
+        self.locks: Dict[str, asyncio.Lock] = {}
+        self.active = 0
+        self.retired = False
+        self.torn_down = False
+    
+    async def ensure_ready(self, node_id: str) -> BaseNode:
+        """Get an instance, running its setup() on first use"""
+        instance = self.instances[node_id]
+        if node_id not in self.ready:
+            lock = self.locks.setdefault(node_id, asyncio.Lock())
+            async with lock:
+                if node_id not in self.ready:
+                    await instance.setup()
+                    self.ready.add(node_id)
+        return instance
+    
+    async def teardown(self):
+        """Tear down every instance whose setup() ran"""
+        if self.torn_down:
+            return
+        self.torn_down = True
+        for node_id in list(self.ready):
+            try:
+                await self.instances[node_id].teardown()
+            except Exception as e:
+                logger.error(f"Error tearing down node {node_id}: {e}")
+        self.ready.clear()
+
 class WorkflowEngine:
     """Main workflow execution engine"""
     
     def __init__(self, config_manager=None):
         self.config_manager = config_manager
         self.workflows: Dict[str, Dict] = {}
-        self.executions: Dict[str, Dict] = {}
+        self.plans: Dict[str, ExecutionPlan] = {}
+        self.node_sets: Dict[str, _NodeSet] = {}
+        self._retired_node_sets: List[_NodeSet] = []
         self.node_registry = {
             "http": HTTPNode,
             "ai": AINode,
@@ -48,8 +133,89 @@ class WorkflowEngine:
             "database": DatabaseNode,
             "image": ImageNode,
             "voiceover": VoiceoverNode,
+            "map": MapNode,
         }
-        self.running_workflows: Dict[str, asyncio.Task] = {}
+        self.running_executions: Dict[str, asyncio.Task] = {}
+        self.executions = ExecutionHistory(self._get_config_section("history"))
+        self.journal = ExecutionJournal(self._get_config_section("journal"))
+        self._stop_requested: Set[str] = set()
+        self.running_workflows: Dict[str, Set[str]] = {}
+        self._execution_slots: Dict[str, _ExecutionSlots] = {}
+        
+        # Global cap on nodes running at once across all executions
+        engine_config = self._get_engine_config()
+        max_concurrent_nodes = engine_config.get("max_concurrent_nodes")
+        self.node_semaphore = asyncio.Semaphore(max_concurrent_nodes) if max_concurrent_nodes else None
+        
+        # Pools for "thread" and "cpu" nodes, so blocking work stays off the event loop
+        self.executors = NodeExecutors(engine_config)
+        
+        # Records a streaming node may run ahead of its slowest consumer
+        self.stream_buffer_size = engine_config.get("stream_buffer_size", 100)
+        
+        # Connection pool shared by all network nodes
+        self.http_pool = HTTPClientPool(self._get_config_section("http"))
+        
+        # Opt-in response cache for AI/image nodes ("cache" node parameter)
+        self.response_cache = ResponseCache(self._get_config_section("cache"))
+        
+        # Per-host circuit breakers shared by every network node
+        self.circuit_breakers = CircuitBreakers(self._get_config_section("circuit_breaker"))
+        
+        # Client-side rate limits per provider host and API key
+        self.rate_limiters = RateLimiters(self._get_config_section("rate_limits"))
+        
+        # Per-node timing and size histograms ("metrics" config section)
+        self.metrics = EngineMetrics(self._get_config_section("metrics"))
+        
+        # Identical in-flight node calls share one result ("coalesce" node parameter)
+        self.single_flight = SingleFlight()
+        
+        # Write-behind batching of DatabaseNode upserts ("batch_writes")
+        database_config = self._get_config_section("database")
+        self.write_batcher = WriteBatcher(
+            max_batch_size=database_config.get("batch_max_size", 100),
+            max_delay=database_config.get("batch_max_delay", 0.05),
+        )
+    
+    def _get_config_section(self, section: str) -> Dict:
+        """Get a section of the configuration"""
+        if self.config_manager:
+            return self.config_manager.get_config().get(section, {})
+        return {}
+    
+    def _get_engine_config(self) -> Dict:
+        """Get the 'engine' section of the configuration"""
+        return self._get_config_section("engine")
+    
+    async def shutdown(self):
+        """Release resources held by the engine
+
+        Executions still running are cancelled first (their journals are
+        kept, so they can be resumed) and their bookkeeping runs before the
+        journal and history writers close.
+        """
+        tasks = [task for task in self.running_executions.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for node_set in list(self.node_sets.values()) + self._retired_node_sets:
+            await node_set.teardown()
+        self._retired_node_sets.clear()
+        await self.write_batcher.close()
+        await self.http_pool.close()
+        self.response_cache.close()
+        self.executions.close()
+        await self.journal.close()
+        self.executors.shutdown()
+        await self.metrics.stop_server()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.shutdown()
     
     def register_node_type(self, node_type: str, node_class):
         """Register a custom node type"""
@@ -70,14 +236,76 @@ class WorkflowEngine:
                     raise ValueError(f"Node {node.get('id', 'unknown')} missing 'type'")
                 if node["type"] not in self.node_registry:
                     raise ValueError(f"Unknown node type: {node['type']}")
+                if node.get("execution_class", "io") not in EXECUTION_CLASSES:
+                    raise ValueError(f"Unknown execution class: {node['execution_class']}")
+                # Parse parameter templates up front so malformed ones fail the load
+                compile_parameters(node.get("parameters", {}), self.node_registry[node["type"]].raw_parameters)
+            
+            # Compile graph once; every execution reuses the plan
+            plan = compile_workflow(workflow_def)
+            if plan.cycles:
+                raise ValueError(f"Workflow contains cycles: {plan.describe_cycles()}")
+            if plan.unreachable:
+                logger.warning(
+                    f"Workflow '{workflow_id}' has nodes unreachable from its entry points: "
+                    f"{', '.join(plan.unreachable)}"
+                )
+            
+            # Create node instances once; executions reuse them
+            node_set = _NodeSet(workflow_id, {
+                node_id: self._create_node(plan.get_node(node_id)) for node_id in plan.order
+            })
             
             self.workflows[workflow_id] = workflow_def
+            self.plans[workflow_id] = plan
+            self._retire_node_set(self.node_sets.get(workflow_id))
+            self.node_sets[workflow_id] = node_set
+            # New executions pick up the (possibly changed) limits
+            self._execution_slots.pop(workflow_id, None)
             logger.info(f"Workflow '{workflow_id}' loaded successfully")
             return True
         except Exception as e:
             logger.error(f"Error loading workflow: {e}")
             return False
     
+    def _create_node(self, node: Dict) -> BaseNode:
+        """Instantiate a node and inject the engine's shared services"""
+        node_class = self.node_registry.get(node["type"])
+        if not node_class:
+            raise ValueError(f"Unknown node type: {node['type']}")
+        node_instance = node_class(node, self.config_manager)
+        node_instance.http_pool = self.http_pool
+        node_instance.response_cache = self.response_cache
+        node_instance.write_batcher = self.write_batcher
+        node_instance.circuit_breakers = self.circuit_breakers
+        node_instance.rate_limiters = self.rate_limiters
+        node_instance.subworkflow_runner = self.run_subworkflow
+        return node_instance
+    
+    def _retire_node_set(self, node_set: Optional[_NodeSet]):
+        """Tear down a replaced node set once no execution uses it"""
+        if node_set is None:
+            return
+        node_set.retired = True
+        if node_set.active:
+            return
+        try:
+            asyncio.get_running_loop().create_task(node_set.teardown())
+        except RuntimeError:
+            # No running loop; tear down on shutdown
+            self._retired_node_sets.append(node_set)
+    
+    async def unload_workflow(self, workflow_id: str) -> bool:
+        """Unload a workflow, tearing down its node instances"""
+        if workflow_id not in self.workflows:
+            return False
+        del self.workflows[workflow_id]
+        del self.plans[workflow_id]
+        self._execution_slots.pop(workflow_id, None)
+        self._retire_node_set(self.node_sets.pop(workflow_id, None))
+        logger.info(f"Workflow '{workflow_id}' unloaded")
+        return True
+    
     def load_workflow_from_file(self, workflow_id: str, file_path: str):
         """Load workflow from JSON file"""
         try:
@@ -89,166 +317,455 @@ class WorkflowEngine:
             return False
     
     async def execute_workflow(self, workflow_id: str, initial_data: Optional[Dict] = None) -> str:
-        """Execute a workflow asynchronously"""
+        """Execute a workflow asynchronously
+        
+        Executions beyond the workflow's concurrency limit wait in a bounded
+        queue; ExecutionQueueFullError is raised when that queue is full.
+        """
         if workflow_id not in self.workflows:
             raise ValueError(f"Workflow '{workflow_id}' not found")
         
-        if workflow_id in self.running_workflows:
-            raise ValueError(f"Workflow '{workflow_id}' is already running")
+        execution_id = f"{workflow_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        self._start_execution(workflow_id, execution_id, initial_data or {})
+        return execution_id
+    
+    async def resume_executions(self) -> List[str]:
+        """Resume executions left unfinished by a previous process
         
-        execution_id = f"{workflow_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        Requires the journal to be enabled and the workflows to be loaded.
+        Nodes checkpointed in the journal are not run again; their recorded
+        results are reused. Executions of workflows that are not loaded are
+        left in the journal; those whose definition has changed since are
+        restarted from the beginning.
+        """
+        resumed = []
+        if not self.journal.enabled:
+            return resumed
         
-        # Create execution task
-        task = asyncio.create_task(
-            self._execute_workflow_internal(workflow_id, execution_id, initial_data or {})
-        )
-        self.running_workflows[workflow_id] = task
+        for state in self.journal.load_incomplete():
+            workflow_id = state["workflow_id"]
+            execution_id = state["id"]
+            if workflow_id not in self.workflows:
+                logger.warning(f"Cannot resume execution '{execution_id}': workflow '{workflow_id}' not loaded")
+                continue
+            if execution_id in self.running_executions:
+                continue
+            
+            completed = state["completed"]
+            if state.get("definition") != definition_hash(self.workflows[workflow_id]):
+                logger.warning(f"Workflow '{workflow_id}' changed since execution '{execution_id}'; restarting it")
+                self.journal.discard(execution_id)
+                completed = None
+            
+            try:
+                self._start_execution(workflow_id, execution_id, state.get("initial_data") or {}, completed)
+            except ExecutionQueueFullError as e:
+                logger.warning(f"Cannot resume execution '{execution_id}' yet: {e}")
+                continue
+            self.executions[execution_id]["resumed_nodes"] = list(completed or {})
+            logger.info(f"Resumed execution '{execution_id}' ({len(completed or {})} nodes checkpointed)")
+            resumed.append(execution_id)
         
-        return execution_id
+        return resumed
     
-    async def _execute_workflow_internal(self, workflow_id: str, execution_id: str, initial_data: Dict):
-        """Internal workflow execution"""
-        workflow = self.workflows[workflow_id]
-        nodes = workflow["nodes"]
-        connections = workflow.get("connections", {})
+    def _start_execution(
+        self,
+        workflow_id: str,
+        execution_id: str,
+        initial_data: Dict,
+        completed: Optional[Dict[str, Dict]] = None
+    ):
+        """Queue an execution task for a loaded workflow, resuming from `completed` checkpoints if given"""
+        slots = self._get_execution_slots(workflow_id)
+        slots.reserve(workflow_id)
         
-        execution = {
+        # Pin the compiled plan and node instances for this execution
+        plan = self.plans[workflow_id]
+        node_set = self.node_sets[workflow_id]
+        node_set.active += 1
+        
+        self.executions[execution_id] = {
             "id": execution_id,
             "workflow_id": workflow_id,
-            "status": "running",
-            "started_at": datetime.now().isoformat(),
+            "status": "queued",
+            "queued_at": datetime.now().isoformat(),
             "data": {},
             "errors": []
         }
-        self.executions[execution_id] = execution
+        if completed is None:
+            self.journal.execution_started(execution_id, workflow_id, plan.workflow_def, initial_data)
         
-        try:
-            # Find trigger nodes (entry points)
-            trigger_nodes = [n for n in nodes if n.get("type") == "trigger"]
-            
-            if not trigger_nodes:
-                # If no triggers, start from first node
-                trigger_nodes = [nodes[0]] if nodes else []
-            
-            # Execute from trigger nodes
-            node_data = {}
-            for trigger_node in trigger_nodes:
-                node_id = trigger_node["id"]
-                result = await self._execute_node(trigger_node, initial_data, execution_id)
-                node_data[node_id] = result
-            
-            # Execute connected nodes
-            await self._execute_connected_nodes(
-                trigger_nodes, nodes, connections, node_data, execution_id
+        # Create execution task
+        task = asyncio.create_task(
+            self._execute_workflow_internal(execution_id, initial_data, slots, plan, node_set, completed)
+        )
+        self.running_executions[execution_id] = task
+        self.running_workflows.setdefault(workflow_id, set()).add(execution_id)
+        task.add_done_callback(
+            lambda t: self._finish_execution(workflow_id, execution_id, slots, node_set, t)
+        )
+    
+    def _get_execution_slots(self, workflow_id: str) -> _ExecutionSlots:
+        """Get the execution limiter of a workflow, creating it on first use"""
+        slots = self._execution_slots.get(workflow_id)
+        if slots is None:
+            engine_config = self._get_engine_config()
+            settings = self.plans[workflow_id].workflow_def.get("settings", {})
+            slots = _ExecutionSlots(
+                max_running=settings.get(
+                    "max_concurrent_executions",
+                    engine_config.get("max_concurrent_executions", 10)
+                ),
+                max_queued=settings.get(
+                    "max_queued_executions",
+                    engine_config.get("max_queued_executions", 100)
+                ),
             )
-            
-            execution["status"] = "completed"
-            execution["completed_at"] = datetime.now().isoformat()
-            execution["data"] = node_data
-            
-        except Exception as e:
-            logger.error(f"Error executing workflow: {e}")
-            execution["status"] = "error"
-            execution["error"] = str(e)
-            execution["errors"].append(str(e))
+            self._execution_slots[workflow_id] = slots
+        return slots
+    
+    def _finish_execution(
+        self,
+        workflow_id: str,
+        execution_id: str,
+        slots: _ExecutionSlots,
+        node_set: _NodeSet,
+        task: asyncio.Task
+    ):
+        """Release bookkeeping once an execution task is done"""
+        node_set.active -= 1
+        if node_set.retired and not node_set.active:
+            self._retire_node_set(node_set)
         
-        finally:
-            if workflow_id in self.running_workflows:
+        self.running_executions.pop(execution_id, None)
+        execution_ids = self.running_workflows.get(workflow_id)
+        if execution_ids is not None:
+            execution_ids.discard(execution_id)
+            if not execution_ids:
                 del self.running_workflows[workflow_id]
         
+        execution = self.executions.get(execution_id)
+        if task.cancelled() and execution is not None:
+            # Cancelled before the task got a chance to record it
+            if execution["status"] == "queued":
+                slots.queued -= 1
+            if execution["status"] in ("queued", "running"):
+                execution["status"] = "cancelled"
+                execution["completed_at"] = datetime.now().isoformat()
+        
+        if execution is not None:
+            self.metrics.observe_execution(workflow_id, execution["status"], self._execution_seconds(execution))
+        
+        # Finished records move under the history retention policy
+        self.executions.complete(execution_id)
+        
+        # A finished or deliberately stopped execution needs no resuming; one
+        # cancelled any other way (the process going down) keeps its journal
+        if task.cancelled() and execution_id not in self._stop_requested:
+            self.journal.execution_interrupted(execution_id)
+        else:
+            self.journal.execution_finished(execution_id)
+        self._stop_requested.discard(execution_id)
+    
+    async def _execute_workflow_internal(
+        self,
+        execution_id: str,
+        initial_data: Dict,
+        slots: _ExecutionSlots,
+        plan: ExecutionPlan,
+        node_set: _NodeSet,
+        completed: Optional[Dict[str, Dict]] = None
+    ):
+        """Internal workflow execution"""
+        execution = self.executions[execution_id]
+        
+        async with slots.semaphore:
+            slots.queued -= 1
+            slots.running += 1
+            execution["status"] = "running"
+            execution["started_at"] = datetime.now().isoformat()
+            
+            try:
+                # Run every node once its predecessors have settled
+                settings = plan.workflow_def.get("settings", {})
+                scheduler = DAGScheduler(
+                    plan,
+                    lambda node, input_data, queue_wait: self._execute_journaled_node(
+                        node, input_data, execution_id, node_set, queue_wait
+                    ),
+                    max_concurrency=settings.get("max_concurrency"),
+                    global_semaphore=self.node_semaphore,
+                )
+                node_data = await scheduler.run(initial_data, completed)
+                
+                execution["status"] = "completed"
+                execution["completed_at"] = datetime.now().isoformat()
+                execution["data"] = node_data
+                
+            except asyncio.CancelledError:
+                logger.info(f"Execution '{execution_id}' cancelled")
+                execution["status"] = "cancelled"
+                execution["completed_at"] = datetime.now().isoformat()
+                raise
+            
+            except Exception as e:
+                logger.error(f"Error executing workflow: {e}")
+                execution["status"] = "error"
+                execution["error"] = str(e)
+                execution["errors"].append(str(e))
+            
+            finally:
+                slots.running -= 1
+        
         return execution
     
-    async def _execute_node(self, node: Dict, input_data: Dict, execution_id: str) -> Dict:
-        """Execute a single node"""
+    async def _execute_journaled_node(
+        self,
+        node: Dict,
+        input_data: Any,
+        execution_id: str,
+        node_set: _NodeSet,
+        queue_wait: float = 0.0
+    ) -> Dict:
+        """Execute a node, checkpointing its result in the journal"""
+        self.journal.node_started(execution_id, node["id"])
+        result = await self._execute_node(node, input_data, execution_id, node_set, queue_wait)
+        # Streams cannot be replayed; such nodes run again on resume
+        if result.get("success") and not isinstance(result.get("data"), RecordStream):
+            self.journal.node_completed(execution_id, node["id"], result)
+        return result
+    
+    async def _execute_node(
+        self,
+        node: Dict,
+        input_data: Dict,
+        execution_id: str,
+        node_set: Optional[_NodeSet] = None,
+        queue_wait: float = 0.0
+    ) -> Dict:
+        """Execute a single node
+        
+        The result carries "metrics": queue wait for a concurrency slot,
+        duration (retries included), input/output size, retries and cache hits.
+        """
         node_id = node["id"]
         node_type = node["type"]
         
         logger.info(f"Executing node: {node_id} (type: {node_type})")
         
+        started = time.perf_counter()
+        node_metrics = {"queue_wait_ms": round(queue_wait * 1000, 3), "retries": 0, "cache_hits": 0}
+        
+        def count_retry(attempt: int):
+            node_metrics["retries"] = attempt
+        
+        streams = input_streams(input_data)
+        claimed = False
+        subscription = None
+        input_token = None
         try:
-            # Get node class
-            node_class = self.node_registry.get(node_type)
-            if not node_class:
-                raise ValueError(f"Unknown node type: {node_type}")
+            # Reuse the warm instance of the compiled workflow when available
+            if node_set is not None and node_id in node_set.instances:
+                node_instance = await node_set.ensure_ready(node_id)
+            else:
+                node_instance = self._create_node(node)
             
-            # Create node instance
-            node_instance = node_class(node, self.config_manager)
+            # Streamed input is consumed incrementally by nodes that accept it;
+            # everyone else gets the full value
+            claimed = True
+            if (isinstance(input_data, RecordStream) and node_instance.accepts_stream
+                    and node.get("mode") != "items"):
+                subscription = input_data.subscribe()
+                input_data = subscription
+            else:
+                input_data = await materialize_streams(input_data)
             
-            # Execute node
-            result = await node_instance.execute(input_data)
+            if self.metrics.measure_bytes and subscription is None:
+                node_metrics["bytes_in"] = payload_size(input_data)
             
-            return {
+            # Parameter templates render against this input ($json)
+            input_token = bind_input(input_data)
+            
+            execution_class = node_instance.get_execution_class()
+            if subscription is not None:
+                # Streams are bound to the event loop
+                execution_class = "io"
+            
+            if node.get("mode") == "items":
+                # Items mode: the node processes the whole list of records at once
+                items = to_items(input_data)
+                if execution_class == "io":
+                    call = lambda: node_instance.execute_batch(items)
+                else:
+                    call = lambda: self.executors.run(execution_class, node_instance, items, items=True)
+            elif execution_class == "io":
+                call = lambda: node_instance.execute(input_data)
+            else:
+                call = lambda: self.executors.run(execution_class, node_instance, input_data)
+            
+            # Timeout and retries declared on the node definition; a consumed
+            # input stream cannot be replayed, so such nodes are not retried
+            policy = node_instance.retry_policy
+            if policy is not None:
+                attempt = call
+                call = lambda: policy.run(
+                    attempt, f"Node {node_id}", retry=subscription is None, on_retry=count_retry
+                )
+            
+            # Execute node, joining an identical call already in flight
+            coalesce_key = None
+            if subscription is None and node.get("mode") != "items":
+                coalesce_key = node_instance.get_coalesce_key(input_data)
+            if coalesce_key is not None:
+                result = await self.single_flight.do(coalesce_key, call)
+            else:
+                result = await call()
+            
+            # Streamed output: successors start on the first record. A node
+            # that transforms its input stream keeps reading it until its own
+            # output closes.
+            if is_async_iterable(result):
+                on_close = subscription.close if subscription is not None else None
+                subscription = None
+                result = RecordStream(
+                    result, name=node_id, max_buffer=self.stream_buffer_size, on_close=on_close
+                )
+            
+            # Streamed output is timed to its first record and not sized
+            if self.metrics.measure_bytes and not isinstance(result, RecordStream):
+                node_metrics["bytes_out"] = payload_size(result)
+            node_metrics["cache_hits"] = count_cache_hits(result)
+            node_metrics["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            self._observe_node(node_set, node_id, node_type, node_metrics, True)
+            
+            node_result = {
                 "node_id": node_id,
                 "success": True,
                 "data": result,
+                "metrics": node_metrics,
                 "timestamp": datetime.now().isoformat()
             }
+            branch = node_instance.get_branch(result)
+            if branch is not None:
+                node_result["branch"] = branch
+            return node_result
         except Exception as e:
             logger.error(f"Error executing node {node_id}: {e}")
+            node_metrics["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            self._observe_node(node_set, node_id, node_type, node_metrics, False)
             return {
                 "node_id": node_id,
                 "success": False,
                 "error": str(e),
+                "metrics": node_metrics,
                 "timestamp": datetime.now().isoformat()
             }
+        finally:
+            if input_token is not None:
+                reset_input(input_token)
+            if subscription is not None:
+                subscription.close()
+            if not claimed:
+                for stream in streams:
+                    stream.release()
     
-    async def _execute_connected_nodes(
-        self, 
-        source_nodes: List[Dict], 
-        all_nodes: List[Dict],
-        connections: Dict,
-        node_data: Dict,
-        execution_id: str
+    def _observe_node(
+        self,
+        node_set: Optional[_NodeSet],
+        node_id: str,
+        node_type: str,
+        node_metrics: Dict,
+        success: bool
     ):
-        """Execute nodes connected to source nodes"""
-        visited = set()
-        queue = [(node["id"], node_data.get(node["id"], {})) for node in source_nodes]
+        """Add a node run to the aggregated metrics of its workflow"""
+        workflow_id = node_set.workflow_id if node_set is not None else "unknown"
+        self.metrics.observe_node(workflow_id, node_id, node_type, node_metrics, success)
+    
+    @staticmethod
+    def _execution_seconds(execution: Dict) -> Optional[float]:
+        """Run time of a finished execution record, if it started"""
+        if not execution.get("started_at") or not execution.get("completed_at"):
+            return None
+        started = datetime.fromisoformat(execution["started_at"])
+        return (datetime.fromisoformat(execution["completed_at"]) - started).total_seconds()
+    
+    async def run_subworkflow(self, workflow_id: str, initial_data: Any) -> Any:
+        """Run a loaded workflow inline and return the output of its final nodes
         
-        while queue:
-            current_node_id, current_data = queue.pop(0)
-            
-            if current_node_id in visited:
-                continue
-            
-            visited.add(current_node_id)
-            
-            # Find connected nodes
-            connected_node_ids = connections.get(current_node_id, [])
-            
-            for connected_node_id in connected_node_ids:
-                if connected_node_id in visited:
-                    continue
-                
-                # Find node definition
-                connected_node = next(
-                    (n for n in all_nodes if n["id"] == connected_node_id), 
-                    None
-                )
-                
-                if not connected_node:
-                    continue
-                
-                # Execute connected node
-                result = await self._execute_node(connected_node, current_data, execution_id)
-                node_data[connected_node_id] = result
-                
-                # Add to queue if successful
-                if result.get("success"):
-                    queue.append((connected_node_id, result.get("data", {})))
+        Used by nodes that fan out to a sub-graph (MapNode). The run bypasses
+        the execution queue and the global node limit, since the calling
+        node already holds a slot. With a single final node its output is
+        returned; otherwise a dict keyed by final node id. Raises
+        RuntimeError when a final node failed or was skipped.
+        """
+        plan = self.plans.get(workflow_id)
+        if plan is None:
+            raise ValueError(f"Workflow '{workflow_id}' not found")
+        node_set = self.node_sets[workflow_id]
+        
+        node_set.active += 1
+        try:
+            settings = plan.workflow_def.get("settings", {})
+            scheduler = DAGScheduler(
+                plan,
+                lambda node, input_data, queue_wait: self._execute_node(
+                    node, input_data, workflow_id, node_set, queue_wait
+                ),
+                max_concurrency=settings.get("max_concurrency"),
+            )
+            node_data = await scheduler.run(initial_data)
+        finally:
+            node_set.active -= 1
+            if node_set.retired and not node_set.active:
+                self._retire_node_set(node_set)
+        
+        sinks = [node_id for node_id in plan.order
+                 if not plan.get_successors(node_id) and node_id not in plan.unreachable]
+        outputs = {}
+        for node_id in sinks:
+            result = node_data.get(node_id)
+            if result is None:
+                raise RuntimeError(f"Sub-workflow '{workflow_id}' skipped node {node_id}")
+            if not result.get("success"):
+                raise RuntimeError(f"Sub-workflow '{workflow_id}' node {node_id} failed: {result.get('error')}")
+            outputs[node_id] = result.get("data")
+        if len(outputs) == 1:
+            return next(iter(outputs.values()))
+        return outputs
     
     def get_execution_status(self, execution_id: str) -> Optional[Dict]:
         """Get execution status"""
         return self.executions.get(execution_id)
     
-    def stop_workflow(self, workflow_id: str):
-        """Stop a running workflow"""
-        if workflow_id in self.running_workflows:
-            task = self.running_workflows[workflow_id]
-            task.cancel()
-            del self.running_workflows[workflow_id]
-            logger.info(f"Workflow '{workflow_id}' stopped")
-            return True
-        return False
+    async def wait_for_execution(self, execution_id: str, timeout: Optional[float] = None) -> Optional[Dict]:
+        """Wait until an execution has finished and return its status"""
+        task = self.running_executions.get(execution_id)
+        if task is not None:
+            await asyncio.wait({task}, timeout=timeout)
+        return self.get_execution_status(execution_id)
+    
+    def stop_execution(self, execution_id: str) -> bool:
+        """Stop a single running or queued execution"""
+        task = self.running_executions.get(execution_id)
+        if task is None or task.done():
+            return False
+        self._stop_requested.add(execution_id)
+        task.cancel()
+        logger.info(f"Execution '{execution_id}' stopped")
+        return True
+    
+    def stop_workflow(self, workflow_id: str, execution_id: Optional[str] = None):
+        """Stop one execution of a workflow, or all of them when no execution_id is given"""
+        execution_ids = self.running_workflows.get(workflow_id, set())
+        if execution_id is not None:
+            if execution_id not in execution_ids:
+                return False
+            return self.stop_execution(execution_id)
+        
+        stopped = [eid for eid in list(execution_ids) if self.stop_execution(eid)]
+        if stopped:
+            logger.info(f"Workflow '{workflow_id}' stopped ({len(stopped)} executions)")
+        return bool(stopped)
     
     def list_workflows(self) -> List[str]:
         """List all loaded workflows"""
@@ -257,3 +774,19 @@ class WorkflowEngine:
     def get_workflow(self, workflow_id: str) -> Optional[Dict]:
         """Get workflow definition"""
         return self.workflows.get(workflow_id)
+    
+    def get_plan(self, workflow_id: str) -> Optional[ExecutionPlan]:
+        """Get the compiled execution plan of a workflow"""
+        return self.plans.get(workflow_id)
+    
+    def get_metrics(self, workflow_id: Optional[str] = None) -> Dict[str, Any]:
+        """Aggregated node and execution metrics, per workflow, node and node type"""
+        return self.metrics.get_metrics(workflow_id)
+    
+    def get_prometheus_metrics(self) -> str:
+        """Aggregated metrics in the Prometheus text exposition format"""
+        return self.metrics.to_prometheus()
+    
+    async def start_metrics_server(self, host: Optional[str] = None, port: Optional[int] = None) -> str:
+        """Serve /metrics on a local port (defaults from the "metrics" config); returns its base URL"""
+        return await self.metrics.start_server(host, port)